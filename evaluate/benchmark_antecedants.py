@@ -0,0 +1,69 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+import time
+import numpy as np
+
+from use_case.fuzzy_constraints.no_humans import get_no_humans_fis
+from use_case.fuzzy_constraints.enough_space import get_enough_space_fis
+from use_case.fuzzy_constraints.sufficient_qos import get_sufficient_qos_fis
+from use_case.fuzzy_constraints.amr_velocity import get_amr_velocity_fis
+
+
+def get_use_case_fis(n_samples):
+    return {
+        "No humans": get_no_humans_fis(n_samples)[-1],
+        "Enough space": get_enough_space_fis(n_samples)[-1],
+        "Sufficient QoS": get_sufficient_qos_fis(n_samples)[-1],
+        "AMR velocity": get_amr_velocity_fis(n_samples)[-1]
+    }
+
+
+def get_random_inputs(fis, n_inputs, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        name: rng.uniform(antecedant.universe[0], antecedant.universe[-1], n_inputs) for name, antecedant in fis.antecedants.items()
+    }
+
+
+def time_rules(evaluators, inputs, repetitions=1, n_runs=5):
+    # Average time to evaluate the antecedants of all rules once for each element of inputs, best of n_runs
+    times = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        for _ in range(repetitions):
+            for single_input in inputs:
+                for evaluate in evaluators:
+                    evaluate(single_input)
+        times.append((time.perf_counter() - start) / repetitions)
+    return min(times)
+
+
+def walk_antecedants(fis):
+    return [
+        lambda inputs, rule=rule: rule.evaluate_antecedant_term(rule.antecedant_term, inputs, fis.antecedants) for rule in fis.rules
+    ]
+
+
+def compiled_antecedants(fis):
+    # Rules bound to the membership functions of the FIS, as evaluated by compute
+    return [rule.bind_antecedants(fis.antecedants) for rule in fis.rules]
+
+
+def benchmark_antecedants(n_samples, n_inputs=1000):
+    for name, fis in get_use_case_fis(n_samples).items():
+        inputs = get_random_inputs(fis, n_inputs)
+        scalar_inputs = [{key: value[i] for key, value in inputs.items()} for i in range(n_inputs)]
+
+        walk_scalar = time_rules(walk_antecedants(fis), scalar_inputs)
+        compiled_scalar = time_rules(compiled_antecedants(fis), scalar_inputs)
+        walk_array = time_rules(walk_antecedants(fis), [inputs], 100)
+        compiled_array = time_rules(compiled_antecedants(fis), [inputs], 100)
+
+        print(f"{name}: {n_inputs} scalar inputs take {walk_scalar:.4f} s walking the parse tree and {compiled_scalar:.4f} s compiled "
+              f"({walk_scalar / compiled_scalar:.2f}x), one array of {n_inputs} inputs takes {walk_array * 1e6:.1f} us walking and "
+              f"{compiled_array * 1e6:.1f} us compiled ({walk_array / compiled_array:.2f}x)")
+    print()
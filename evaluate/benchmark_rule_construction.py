@@ -0,0 +1,63 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+import time
+import numpy as np
+from pyparsing import infixNotation, Keyword, opAssoc, Literal, Or
+
+from src.model.fuzzy_inference.fuzzy_logic import parse_antecedant_term
+from src.model.fuzzy_inference.sugeno import SugenoRule, Polynomial
+
+
+def parse_with_rule_grammar(antecedant_term):
+    # Former construction of a Rule: a new grammar from the literals of every single antecedant term
+    words = [word.replace("(", "").replace(")", "") for word in antecedant_term.split(" ")]
+    literals = [word for word in words if word not in ["and", "or", "not", "is"]]
+    expr = infixNotation(
+        Or(Literal(literal) for literal in literals),
+        [
+            (Keyword("is"), 2, opAssoc.LEFT),
+            (Keyword("not"), 1, opAssoc.RIGHT),
+            (Keyword("and"), 2, opAssoc.LEFT),
+            (Keyword("or"), 2, opAssoc.LEFT)
+        ]
+    )
+    return expr.parseString(antecedant_term)[0]
+
+
+def get_taylor_expansion_terms(n_rules):
+    # Antecedants like in amr_velocity.py for finer partitions of load weight and surface gradient
+    n_partitions = int(np.ceil(np.sqrt(n_rules)))
+    return [
+        f"LoadWeight is Load{i // n_partitions} and SurfaceGradient is Gradient{i % n_partitions}" for i in range(n_rules)
+    ]
+
+
+def benchmark_rule_construction(n_rules_list=(1000, 10000)):
+    polynomial = Polynomial({"LoadWeight": 0.0, "SurfaceGradient": 0.0, "Constant": 1.0})
+    for n_rules in n_rules_list:
+        antecedant_terms = get_taylor_expansion_terms(n_rules)
+
+        start = time.perf_counter()
+        for antecedant_term in antecedant_terms:
+            parse_with_rule_grammar(antecedant_term)
+        rule_grammar_time = time.perf_counter() - start
+
+        parse_antecedant_term.cache_clear()
+        start = time.perf_counter()
+        for antecedant_term in antecedant_terms:
+            SugenoRule(antecedant_term, polynomial)
+        shared_parser_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for antecedant_term in antecedant_terms:
+            SugenoRule(antecedant_term, polynomial)
+        cached_time = time.perf_counter() - start
+
+        print(f"{n_rules} rules: {rule_grammar_time:.3f} s with a grammar per rule, {shared_parser_time:.3f} s with the shared parser "
+              f"({rule_grammar_time / shared_parser_time:.1f}x), {cached_time:.3f} s from the parse cache "
+              f"({rule_grammar_time / cached_time:.1f}x)")
+    print()
@@ -0,0 +1,33 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+import time
+
+from use_case.fuzzy_constraints.enough_space import get_enough_space_fis
+from use_case.fuzzy_constraints.sufficient_qos import get_sufficient_qos_fis
+
+from src.model.fuzzy_inference.safe_region import extract_safe_region
+
+from settings import THRESHOLD
+
+
+def benchmark_safe_region(n_samples):
+    # Adaptive refinement at the spacing of the uniform grids in evaluate_correctness against the size of these grids
+    for name, get_fis in [("Enough space", get_enough_space_fis), ("Sufficient QoS", get_sufficient_qos_fis)]:
+        fis = get_fis(n_samples)[-1]
+        resolution = {
+            antecedant: (variable.universe[-1] - variable.universe[0]) / (n_samples - 1) for antecedant, variable in fis.antecedants.items()
+        }
+
+        start = time.perf_counter()
+        safe_region = extract_safe_region(fis, THRESHOLD, resolution)
+        duration = time.perf_counter() - start
+
+        n_grid = n_samples**len(resolution)
+        intervals = ", ".join(f"{antecedant} in [{lower:.4f}, {upper:.4f}]" for antecedant, (lower, upper) in safe_region.get_safe_intervals().items())
+        print(f"{name}: {safe_region.n_evaluations} evaluations in {duration:.3f} s instead of {n_grid} on the grid "
+              f"({n_grid / safe_region.n_evaluations:.1f}x fewer), {intervals}")
+    print()
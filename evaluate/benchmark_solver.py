@@ -0,0 +1,128 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+from src.model.safety_concept_tree import TechnicalRequirement
+from src.parsing.safety_concept_tree_parser import parse_safety_concept_tree
+from src.solver.configurations_solver import ConfigurationsSolver
+
+
+def get_library_csct(n_libraries, n_components, n_systems):
+    # Synthetic CSCT in the format of use_case/csct/csct.txt whose library subtrees are referenced many times via >
+    sections = ["main:\nSafe operation"]
+    sections[0] += "".join(f"\n + >system{i}" for i in range(n_systems))
+    for i in range(n_systems):
+        sections.append(f"system{i}:\nSystem {i}\n + >component{i % n_components}\n + >component{(i + 1) % n_components}")
+    for i in range(n_components):
+        sections.append(f"component{i}:\nComponent {i}" + "".join(f"\n - >library{(i + j) % n_libraries}" for j in range(3)))
+    for i in range(n_libraries):
+        sections.append(
+            f"library{i}:\nLibrary {i}\n - Detection\n  + !t(camera{i}) Camera {i}\n  + !t(lidar{i}) Lidar {i}"
+            f"\n - Reaction\n  + !u(operator{i}) Operator {i}\n  + !c(context{i}) Context {i}"
+            f"\n - Communication\n  + !t(radio{i}) Radio {i}\n  + !c(coverage{i}) Coverage {i}"
+        )
+    return "\n\n".join(sections)
+
+
+def get_wide_csct(n_branches, alternatives=False):
+    # Synthetic CSCT without shared subtrees that requires all branches, or with alternatives any of them
+    lines = ["main:", "Safe operation"]
+    for i in range(n_branches):
+        lines += [
+            f" {'+' if alternatives else '-'} Function {i}", f"  + !c(context{i}) Context {i}", f"  + Fallback {i}",
+            f"   - !t(component{i}) Component {i}", f"   - !u(assumption{i}) Assumption {i}"
+        ]
+    return "\n".join(lines)
+
+
+def get_deep_csct(depth):
+    # Synthetic CSCT whose references to the last level double with every level
+    sections = ["main:\nSafe operation\n - >level0"]
+    for i in range(depth):
+        sections.append(f"level{i}:\nLevel {i}\n - >level{i + 1}\n - !t(component{i}) Component {i}\n - >level{i + 1}")
+    sections.append(f"level{depth}:\nLevel {depth}\n + !t(camera) Camera\n + !t(lidar) Lidar")
+    return "\n\n".join(sections)
+
+
+def parse_csct_text(text):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "csct.txt")
+        with open(path, "w") as f:
+            f.write(text)
+        return parse_safety_concept_tree(path)
+
+
+def time_solver(sct, backend, memoize, n_repetitions=3):
+    # Best of several solves with a new solver each, so that no cut sets are kept between them
+    times = []
+    for _ in range(n_repetitions):
+        solver = ConfigurationsSolver(sct, backend=backend, memoize=memoize)
+        start = time.perf_counter()
+        n_configurations = solver.count_configurations()
+        times.append(time.perf_counter() - start)
+    return min(times), n_configurations
+
+
+def benchmark_solver(n_libraries=4, n_components=4, n_systems=16, depths=(8, 16, 32, 64)):
+    sct = parse_csct_text(get_library_csct(n_libraries, n_components, n_systems))
+    for backend in ConfigurationsSolver.BACKENDS:
+        recomputed_time, n_recomputed = time_solver(sct, backend, memoize=False)
+        memoized_time, n_memoized = time_solver(sct, backend, memoize=True)
+        if n_recomputed != n_memoized:
+            raise RuntimeError("Memoized solver found a different number of configurations")
+        print(f"{backend} backend, {n_memoized} configurations: {recomputed_time:.3f} s recomputing shared subtrees, "
+              f"{memoized_time:.3f} s memoized ({recomputed_time / memoized_time:.1f}x)")
+
+    # Recomputing shared subtrees takes exponential time in the depth, memoized solves should only grow linearly
+    for depth in depths:
+        sct = parse_csct_text(get_deep_csct(depth))
+        times = [time_solver(sct, backend, memoize=True)[0] for backend in ConfigurationsSolver.BACKENDS]
+        print(f"Depth {depth}, {2**depth} references to the last level: " + ", ".join(
+            f"{solve_time:.4f} s with the {backend} backend" for backend, solve_time in zip(ConfigurationsSolver.BACKENDS, times)
+        ))
+    print()
+
+
+def benchmark_incremental_solver(n_branches=2000):
+    # Re-solving after adding an alternative to one branch only recomputes that branch and the root
+    for backend in ConfigurationsSolver.BACKENDS:
+        sct = parse_csct_text(get_wide_csct(n_branches, alternatives=True))
+        solver = ConfigurationsSolver(sct, backend=backend)
+        start = time.perf_counter()
+        solver.count_configurations()
+        solve_time = time.perf_counter() - start
+
+        sct.refinement[n_branches // 2].refinement[1].refinement.append(TechnicalRequirement("Spare component", "spare"))
+        start = time.perf_counter()
+        n_configurations = solver.count_configurations()
+        resolve_time = time.perf_counter() - start
+        print(f"{backend} backend, {5 * n_branches + 1} nodes: {solve_time:.3f} s to solve, {resolve_time:.4f} s to re-solve "
+              f"{solver.n_recomputed} nodes after an edit, {n_configurations} configurations")
+    print()
+
+
+def benchmark_tree_memory(n_branches=20000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "csct.txt")
+        with open(path, "w") as f:
+            f.write(get_wide_csct(n_branches))
+
+        memory = {}
+        for compact in [False, True]:
+            tracemalloc.start()
+            sct = parse_safety_concept_tree(path, compact=compact)
+            memory[compact] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del sct
+
+    n_nodes = 5 * n_branches + 1
+    print(f"{n_nodes} nodes: {memory[False] / n_nodes:.0f} bytes per node as objects, {memory[True] / n_nodes:.0f} bytes per node "
+          f"in a compact tree ({memory[False] / memory[True]:.1f}x)")
+    print()
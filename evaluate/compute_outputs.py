@@ -5,16 +5,18 @@
 
 
 import numpy as np
-import pickle as pkl
 
-from itertools import product
 import time
-from tqdm import tqdm
 
 from use_case.fuzzy_constraints.no_humans import get_no_humans_fis
 from use_case.fuzzy_constraints.enough_space import get_enough_space_fis
 from use_case.fuzzy_constraints.sufficient_qos import get_sufficient_qos_fis
 
+from src.parsing.safety_concept_tree_parser import parse_safety_concept_tree
+from src.runtime.configurations_evaluator import ConfigurationsEvaluator
+from src.runtime.scenario_table import pack_scenario_table
+from src.solver.configurations_solver import ConfigurationsSolver
+
 from settings import THRESHOLD
 
 
@@ -46,6 +48,11 @@ def get_configuration_restrictions(c1, c2, c3, c4, c5):
     return restrictions, configurations
 
 
+def get_product_inputs(names, samples):
+    grids = np.meshgrid(*samples, indexing="ij")
+    return {name: grid.ravel() for name, grid in zip(names, grids)}
+
+
 def compute_outputs(n_samples):
     location_universe, activity_universe, distance_universe, no_humans_fis = get_no_humans_fis(n_samples)
     no_humans = [
@@ -64,58 +71,27 @@ def compute_outputs(n_samples):
         get_samples(latency_universe),
         get_samples(throughput_universe)
     ]
-    context = no_humans_fis.consequent
-
-    e1 = []
-    e2 = []
-    e3 = []
-
-    for location, activity, distance in product(*no_humans):
-        input = {"Location": location, "Activity": activity, "Distance": distance}
-        output = no_humans_fis.compute(input, defuzz=False)
-        e1.append(((activity, distance, location), output))
-
-    for depart_lane, lateral_space, machine_distance in product(*enough_space):
-        input = {"DepartLane": depart_lane, "LateralSpace": lateral_space, "MachineDistance": machine_distance}
-        output = enough_space_fis.compute(input, defuzz=False)
-        e2.append(((depart_lane, lateral_space, machine_distance), output))
-
-    for latency, throughput in product(*sufficient_qos):
-        input = {"Latency": latency, "Throughput": throughput}
-        output = sufficient_qos_fis.compute(input, defuzz=False)
-        e3.append(((latency, throughput), output))
-
-    timing_each = []
-    scenario_configurations = []
-    with tqdm(total=len(e1)*len(e2)*len(e3)) as pbar:
-        for _, e1_value in e1:
-            for _, e2_value in e2:
-                for _, e3_value in e3:
-                    cpu_time_each = time.process_time()
-                    # c1 if e1 >= threshold
-                    c1 = e1_value
-                    c1_safe = context.defuzzify(c1) >= THRESHOLD
-
-                    # c2 if e2 >= threshold
-                    c2 = e2_value
-                    c2_safe = context.defuzzify(c2) >= THRESHOLD
-
-                    # c3 if e2 and e3 >= threshold
-                    c3 = np.fmin(e2_value, e3_value)
-                    c3_safe = context.defuzzify(c3) >= THRESHOLD
-
-                    # c4 if True
-                    c4_safe = True
-
-                    # c5 if e3
-                    c5 = e3_value
-                    c5_safe = context.defuzzify(c5) >= THRESHOLD
-                    timing_each.append(time.process_time() - cpu_time_each)
-
-                    scenario_configurations.append([c1_safe, c2_safe, c3_safe, c4_safe, c5_safe])
-                    pbar.update(1)
-
-    print(np.sum(timing_each), "seconds to compute the output,", np.mean(timing_each), "seconds per iteration, standard deviation of", np.std(timing_each), "\n")
-
-    with open("scenario_configurations.pkl", "wb") as f:
-        pkl.dump(scenario_configurations, f)
+    configurations = ConfigurationsSolver(parse_safety_concept_tree("use_case/csct/csct.txt")).get_configurations()
+    evaluator = ConfigurationsEvaluator(
+        configurations,
+        {"no_humans": no_humans_fis, "enough_space": enough_space_fis, "sufficient_qos": sufficient_qos_fis},
+        THRESHOLD
+    )
+
+    # All combinations of the samples of each context assumption, in the same order as itertools.product
+    inputs = {
+        "no_humans": get_product_inputs(["Location", "Activity", "Distance"], no_humans),
+        "enough_space": get_product_inputs(["DepartLane", "LateralSpace", "MachineDistance"], enough_space),
+        "sufficient_qos": get_product_inputs(["Latency", "Throughput"], sufficient_qos)
+    }
+
+    cpu_time = time.process_time()
+    scenario_table = evaluator.evaluate_product(inputs).reshape(-1, len(configurations))
+    cpu_time = time.process_time() - cpu_time
+
+    print(cpu_time, "seconds to compute the output,", cpu_time / scenario_table.shape[0], "seconds per scenario\n")
+
+    input_names = ["Location", "Activity", "Distance", "DepartLane", "LateralSpace", "MachineDistance", "Latency", "Throughput"]
+    configuration_names = [f"C{key + 1}" for key in configurations.keys()]
+    scenario_configurations = pack_scenario_table(input_names, no_humans + enough_space + sufficient_qos, configuration_names, scenario_table)
+    scenario_configurations.save("scenario_configurations.npz")
@@ -4,39 +4,41 @@
 # Contact: andreas.kreutz@iks.fraunhofer.de
 
 
+import os
 import numpy as np
 import matplotlib.pyplot as plt
 
-from tqdm import tqdm
-
 from use_case.fuzzy_constraints.enough_space import get_enough_space_fis
 from use_case.fuzzy_constraints.sufficient_qos import get_sufficient_qos_fis
 
 from evaluate.get_above_and_below import get_above_and_below
+from evaluate.get_safe_intervals import get_safe_intervals
+from evaluate.grid_sweep import sweep_grid
 
 from settings import THRESHOLD
 
 
-def evaluate_correctness(n_samples):
+def evaluate_correctness(n_samples, n_workers=None, output_dir=None):
+    # With output_dir, the sweeps are stored as resumable memory-mapped files instead of being kept in memory
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
     depart_lane_universe, lateral_space_universe, machine_distance_universe, enough_space_fis = get_enough_space_fis(n_samples)
     latency_universe, throughput_universe, sufficient_qos_fis = get_sufficient_qos_fis(n_samples)
 
-    depart_lane_mat, lateral_space_mat, machine_distance_mat = np.meshgrid(depart_lane_universe, lateral_space_universe, machine_distance_universe)
-
-    enough_space = np.zeros_like(lateral_space_mat)
-    with tqdm(total=n_samples**3, desc="Enough space") as pbar:
-        for i in range(n_samples):
-            for j in range(n_samples):
-                for k in range(n_samples):
-                    enough_space[i,j,k] = enough_space_fis.compute({"DepartLane": depart_lane_mat[i,j,k], "LateralSpace": lateral_space_mat[i,j,k], "MachineDistance": machine_distance_mat[i,j,k]})
-                    pbar.update(1)
+    enough_space_axes = {"DepartLane": depart_lane_universe, "LateralSpace": lateral_space_universe, "MachineDistance": machine_distance_universe}
+    enough_space = sweep_grid(
+        get_enough_space_fis, n_samples, enough_space_axes, n_workers=n_workers, desc="Enough space",
+        output_path=os.path.join(output_dir, "enough_space.dat") if output_dir is not None else None
+    )
 
-    safe_enough_space = np.greater_equal(enough_space, THRESHOLD)
-    output = f"Enough space: DepartLane in [{np.min(depart_lane_mat[safe_enough_space])}, {np.max(depart_lane_mat[safe_enough_space])}], "
-    output += f"LateralSpace in [{np.min(lateral_space_mat[safe_enough_space])}, {np.max(lateral_space_mat[safe_enough_space])}], "
-    output += f"MachineDistance in [{np.min(machine_distance_mat[safe_enough_space])}, {np.max(machine_distance_mat[safe_enough_space])}]"
+    intervals = get_safe_intervals(enough_space, enough_space_axes, THRESHOLD)
+    output = f"Enough space: DepartLane in [{intervals['DepartLane'][0]}, {intervals['DepartLane'][1]}], "
+    output += f"LateralSpace in [{intervals['LateralSpace'][0]}, {intervals['LateralSpace'][1]}], "
+    output += f"MachineDistance in [{intervals['MachineDistance'][0]}, {intervals['MachineDistance'][1]}]"
     print(output)
 
+    lateral_space_mat, machine_distance_mat = np.meshgrid(lateral_space_universe, machine_distance_universe, indexing="ij")
+
     plt.rc("text", usetex=True)
     fig = plt.figure(figsize=(22, 10))
     for i in range(10):
@@ -46,25 +48,24 @@ def evaluate_correctness(n_samples):
             idx = int(i * n_samples/10)
         enough_space_fig = fig.add_subplot(2, 5, i + 1, projection="3d")
         enough_space_fig.set_zlim([0, 1])
-        enough_space_fig.set_title(str(depart_lane_mat[0, idx, 0]))
-        above, below = get_above_and_below(enough_space, THRESHOLD)
-        enough_space_fig.plot_surface(lateral_space_mat[:, 0, :], machine_distance_mat[0, :, :], above[:, idx, :], color="green", vmin=0, vmax=1)
-        enough_space_fig.plot_surface(lateral_space_mat[:, 0, :], machine_distance_mat[0, :, :], below[:, idx, :], cmap="coolwarm_r", vmin=0, vmax=1)
+        enough_space_fig.set_title(str(depart_lane_universe[idx]))
+        above, below = get_above_and_below(enough_space[:, idx, :], THRESHOLD)
+        enough_space_fig.plot_surface(lateral_space_mat, machine_distance_mat, above, color="green", vmin=0, vmax=1)
+        enough_space_fig.plot_surface(lateral_space_mat, machine_distance_mat, below, cmap="coolwarm_r", vmin=0, vmax=1)
         enough_space_fig.set_xlabel("Lateral space")
         enough_space_fig.set_ylabel("Machine distance")
     fig.savefig("output/correctness/enough_space.png")
 
     latency_mat, throughput_mat = np.meshgrid(latency_universe, throughput_universe)
-    sufficient_qos = np.zeros_like(latency_mat)
-    with tqdm(total=n_samples**2, desc="Sufficient QoS") as pbar:
-        for i in range(n_samples):
-            for j in range(n_samples):
-                sufficient_qos[i,j] = sufficient_qos_fis.compute({"Latency": latency_mat[i,j], "Throughput": throughput_mat[i,j]})
-                pbar.update(1)
-
-    safe_sufficient_qos = np.greater_equal(sufficient_qos, THRESHOLD)
-    output = f"Sufficient QoS: Latency in [{np.min(latency_mat[safe_sufficient_qos])}, {np.max(latency_mat[safe_sufficient_qos])}], "
-    output += f"Throughput in [{np.min(throughput_mat[safe_sufficient_qos])}, {np.max(throughput_mat[safe_sufficient_qos])}]"
+    sufficient_qos_axes = {"Latency": latency_universe, "Throughput": throughput_universe}
+    sufficient_qos = sweep_grid(
+        get_sufficient_qos_fis, n_samples, sufficient_qos_axes, n_workers=n_workers, desc="Sufficient QoS",
+        output_path=os.path.join(output_dir, "sufficient_qos.dat") if output_dir is not None else None
+    )
+
+    intervals = get_safe_intervals(sufficient_qos, sufficient_qos_axes, THRESHOLD)
+    output = f"Sufficient QoS: Latency in [{intervals['Latency'][0]}, {intervals['Latency'][1]}], "
+    output += f"Throughput in [{intervals['Throughput'][0]}, {intervals['Throughput'][1]}]"
     print(output)
 
     fig = plt.figure(figsize=(4.4, 3.5))
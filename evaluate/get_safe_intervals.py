@@ -0,0 +1,34 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+import numpy as np
+
+from evaluate.grid_sweep import get_grid_shape
+
+
+def get_safe_intervals(Z, axes, threshold, indexing="xy", chunk_size=16):
+    # Smallest and largest value of every axis with Z >= threshold, reading Z in chunks instead of building meshgrids
+    if Z.shape != get_grid_shape(axes, indexing):
+        raise RuntimeError(f"Grid of shape {Z.shape} does not match the axes {list(axes.keys())}")
+    dimensions = list(range(len(axes)))
+    if indexing == "xy" and len(axes) > 1:
+        dimensions[0], dimensions[1] = 1, 0
+
+    safe = [np.zeros(size, dtype=bool) for size in Z.shape]
+    for start in range(0, Z.shape[0], chunk_size):
+        chunk = np.greater_equal(Z[start:start + chunk_size], threshold)
+        for dimension in range(Z.ndim):
+            other_dimensions = tuple(d for d in range(Z.ndim) if d != dimension)
+            if dimension == 0:
+                safe[0][start:start + chunk_size] = np.any(chunk, axis=other_dimensions)
+            else:
+                safe[dimension] |= np.any(chunk, axis=other_dimensions)
+
+    intervals = {}
+    for (name, axis), dimension in zip(axes.items(), dimensions):
+        values = np.asarray(axis)[safe[dimension]]
+        intervals[name] = (np.min(values), np.max(values)) if values.size > 0 else (np.nan, np.nan)
+    return intervals
@@ -0,0 +1,166 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+import json
+import os
+from multiprocessing import get_all_start_methods, get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Optional
+
+import numpy as np
+from tqdm import tqdm
+
+
+# State of a sweep inside a worker process, set up once by _init_worker
+_worker = {}
+
+
+def get_grid_shape(axes: Dict[str, np.ndarray], indexing="xy"):
+    # Shape of np.meshgrid(*axes.values(), indexing=indexing)
+    shape = [len(axis) for axis in axes.values()]
+    if indexing == "xy" and len(shape) > 1:
+        shape[0], shape[1] = shape[1], shape[0]
+    return tuple(shape)
+
+
+def get_chunk_inputs(axes: Dict[str, np.ndarray], indexing, start, end):
+    # Inputs for the flat grid indices [start, end), without building the full meshgrid
+    shape = get_grid_shape(axes, indexing)
+    indices = np.unravel_index(np.arange(start, end), shape)
+    dimensions = list(range(len(axes)))
+    if indexing == "xy" and len(axes) > 1:
+        dimensions[0], dimensions[1] = 1, 0
+    return {name: axis[indices[dimension]] for (name, axis), dimension in zip(axes.items(), dimensions)}
+
+
+def _open_output(output, shape):
+    # Output is either the name of a shared memory block or the path of a memory-mapped file
+    kind, location = output
+    if kind == "memmap":
+        return None, np.memmap(location, dtype=float, mode="r+", shape=shape)
+    shared_memory = SharedMemory(name=location)
+    return shared_memory, np.ndarray(shape, dtype=float, buffer=shared_memory.buf)
+
+
+def _init_worker(get_fis, n_samples, axes, indexing, fixed_inputs, compute_arguments, output, shape):
+    _worker["fis"] = get_fis(n_samples)[-1]
+    _worker["axes"] = axes
+    _worker["indexing"] = indexing
+    _worker["fixed_inputs"] = fixed_inputs
+    _worker["compute_arguments"] = compute_arguments
+    _worker["shared_memory"], output = _open_output(output, shape)
+    # Grid dimensions are flattened, trailing dimensions such as the universe of aggregates are kept
+    _worker["output"] = output.reshape((-1,) + shape[len(axes):])
+
+
+def _close_worker():
+    if _worker["shared_memory"] is not None:
+        _worker["shared_memory"].close()
+    _worker.clear()
+
+
+def _compute_chunk(chunk):
+    start, end = chunk
+    inputs = get_chunk_inputs(_worker["axes"], _worker["indexing"], start, end)
+    inputs.update(_worker["fixed_inputs"])
+    _worker["output"][start:end] = _worker["fis"].compute_batch(inputs, **_worker["compute_arguments"])
+    if isinstance(_worker["output"], np.memmap):
+        _worker["output"].flush()  # A chunk only counts as completed once it is on disk
+    return chunk
+
+
+def _get_manifest(n_samples, axes, indexing, fixed_inputs, compute_arguments, shape, chunk_size):
+    return {
+        "n_samples": n_samples,
+        "axes": {name: [float(axis[0]), float(axis[-1]), len(axis)] for name, axis in axes.items()},
+        "indexing": indexing,
+        "fixed_inputs": {name: float(value) for name, value in fixed_inputs.items()},
+        "compute_arguments": compute_arguments,
+        "shape": list(shape),
+        "dtype": np.dtype(float).str,
+        "chunk_size": chunk_size,
+        "completed_chunks": []
+    }
+
+
+def _write_manifest(path, manifest):
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f)
+    os.replace(path + ".tmp", path)
+
+
+def sweep_grid(get_fis, n_samples, axes: Dict[str, np.ndarray], fixed_inputs: Optional[Dict[str, float]] = None,
+               n_workers: Optional[int] = None, chunk_size: Optional[int] = None, indexing="xy", desc=None,
+               output_path: Optional[str] = None, **compute_arguments):
+    # Outputs of get_fis(n_samples)[-1] on the meshgrid of axes, computed in chunks, resumable with output_path
+    if n_workers is None:
+        n_workers = os.cpu_count()
+    if fixed_inputs is None:
+        fixed_inputs = {}
+    grid_shape = get_grid_shape(axes, indexing)
+    size = int(np.prod(grid_shape))
+    if chunk_size is None:
+        # Keeps the (chunk, universe) aggregates of a Mamdani FIS at a few million values
+        chunk_size = max(1, 2**22 // n_samples)
+    chunks = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+
+    # Evaluating a single point gives the trailing dimensions of the output
+    probe_inputs = get_chunk_inputs(axes, indexing, 0, 1)
+    probe_inputs.update(fixed_inputs)
+    shape = grid_shape + np.shape(get_fis(n_samples)[-1].compute_batch(probe_inputs, **compute_arguments))[1:]
+
+    shared_memory = None
+    manifest = None
+    if output_path is None:
+        shared_memory = SharedMemory(create=True, size=int(np.prod(shape)) * np.dtype(float).itemsize)
+        output = ("shared_memory", shared_memory.name)
+    else:
+        manifest_path = output_path + ".json"
+        manifest = _get_manifest(n_samples, axes, indexing, fixed_inputs, compute_arguments, shape, chunk_size)
+        if os.path.exists(manifest_path) and os.path.exists(output_path):
+            with open(manifest_path) as f:
+                existing_manifest = json.load(f)
+            if {**existing_manifest, "completed_chunks": []} != manifest:
+                raise RuntimeError(f"{output_path} holds a sweep with different settings")
+            manifest = existing_manifest
+        else:
+            np.memmap(output_path, dtype=float, mode="w+", shape=shape).flush()
+            _write_manifest(manifest_path, manifest)
+        completed = set(manifest["completed_chunks"])
+        chunks = [chunk for chunk in chunks if chunk[0] not in completed]
+        output = ("memmap", output_path)
+
+    try:
+        arguments = (get_fis, n_samples, axes, indexing, fixed_inputs, compute_arguments, output, shape)
+        with tqdm(total=size, initial=size - sum(end - start for start, end in chunks), desc=desc) as pbar:
+            if n_workers == 1:
+                _init_worker(*arguments)
+                completed_chunks = map(_compute_chunk, chunks)
+            else:
+                # Without fork, workers are spawned and import the main module, which needs a main guard
+                context = get_context("fork" if "fork" in get_all_start_methods() else "spawn")
+                pool = context.Pool(n_workers, initializer=_init_worker, initargs=arguments)
+                completed_chunks = pool.imap_unordered(_compute_chunk, chunks)
+
+            try:
+                for start, end in completed_chunks:
+                    if manifest is not None:
+                        manifest["completed_chunks"].append(start)
+                        _write_manifest(output_path + ".json", manifest)
+                    pbar.update(end - start)
+            finally:
+                if n_workers == 1:
+                    _close_worker()
+                else:
+                    pool.terminate()  # All chunks are done or the sweep was interrupted, the workers are no longer needed
+
+        if shared_memory is None:
+            return np.memmap(output_path, dtype=float, mode="r", shape=shape)
+        return np.ndarray(shape, dtype=float, buffer=shared_memory.buf).copy()
+    finally:
+        if shared_memory is not None:
+            shared_memory.close()
+            shared_memory.unlink()
@@ -0,0 +1,31 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+from evaluate.benchmark_antecedants import benchmark_antecedants
+from evaluate.benchmark_rule_construction import benchmark_rule_construction
+from evaluate.benchmark_safe_region import benchmark_safe_region
+from evaluate.benchmark_solver import benchmark_solver, benchmark_incremental_solver, benchmark_tree_memory
+
+
+N_SAMPLES = 200
+
+# Compiled rule antecedants against walking the parse tree
+benchmark_antecedants(N_SAMPLES)
+
+# Rule construction with the shared parser and parse cache against a grammar per rule
+benchmark_rule_construction()
+
+# Adaptive refinement of the safe region against the uniform grids of the correctness evaluation
+benchmark_safe_region(N_SAMPLES)
+
+# Solver backends with memoized cut sets of shared subtrees against recomputing them at every reference
+benchmark_solver()
+
+# Re-solving an edited CSCT, which only recomputes the changed nodes and their ancestors
+benchmark_incremental_solver()
+
+# Memory of parsed CSCTs as requirement objects against the compact array-backed tree
+benchmark_tree_memory()
@@ -4,9 +4,8 @@
 # Contact: andreas.kreutz@iks.fraunhofer.de
 
 
-import pickle as pkl
-
 from evaluate.compute_outputs import compute_outputs
+from src.runtime.scenario_table import load_scenario_table
 
 
 def get_configurations(c1, c2, c3, c4, c5):
@@ -30,5 +29,4 @@ if compute:
     N_SAMPLES = 200
     compute_outputs(N_SAMPLES)
 
-with open("scenario_configurations.pkl", "rb") as f:
-    scenario_configurations = pkl.load(f)
+scenario_configurations = load_scenario_table("scenario_configurations.npz")
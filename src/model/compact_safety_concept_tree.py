@@ -0,0 +1,269 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+from __future__ import annotations
+from typing import Generator, Iterator, List, Optional
+
+import numpy as np
+
+from src.model.safety_concept_tree import (
+    Requirement, RefinedRequirement, ContextAssumption, TechnicalRequirement, UndevelopedRequirement,
+    EmptyRequirement, ParameterContext
+)
+
+
+# Node kinds in the kind array, with the prefixes of their symbols
+REQUIREMENT_TYPES = [RefinedRequirement, ContextAssumption, TechnicalRequirement, UndevelopedRequirement, EmptyRequirement, ParameterContext]
+SYMBOL_PREFIXES = ["g", "e", "t", "u", "n", "p"]
+REFINEMENT_KINDS = ["and", "or", "not"]
+
+
+class CompactSafetyConceptTree:
+    def __init__(self):
+        # Nodes are ids into arrays, the children of node i are children[first_child[i]:first_child[i + 1]]
+        self._kinds = []
+        self._parents = []
+        self._ordinals = []
+        self._refinement_kinds = []
+        self._parameter_contexts = []
+        self._children = []
+        self.descriptions = []
+        self.names = []
+        self.symbol_counters = [1] * len(REQUIREMENT_TYPES)
+
+        self.kind = None
+        self.parent = None
+        self.ordinal = None
+        self.refinement_kind = None
+        self.parameter_context = None
+        self.first_child = None
+        self.children = None
+        self.first_parent = None
+        self.parents = None
+        self.root = None
+        self._views = []
+
+    def add_requirement(self, requirement_type: type, description: str, name: Optional[str] = None):
+        kind = REQUIREMENT_TYPES.index(requirement_type)
+        self._kinds.append(kind)
+        self._parents.append(-1)
+        self._ordinals.append(self.symbol_counters[kind])
+        self.symbol_counters[kind] += 1
+        self._refinement_kinds.append(-1)
+        self._parameter_contexts.append(-1)
+        self._children.append([])
+        self.descriptions.append(description)
+        self.names.append(name)
+        return len(self._kinds) - 1
+
+    def add_child(self, node: int, child: int):
+        self._children[node].append(child)
+        if self._parents[child] == -1:
+            self._parents[child] = node
+
+    def set_refinement_kind(self, node: int, refinement_kind: Optional[str]):
+        self._refinement_kinds[node] = REFINEMENT_KINDS.index(refinement_kind) if refinement_kind is not None else -1
+
+    def set_parameter_context(self, node: int, parameter_context: int):
+        self._parameter_contexts[node] = parameter_context
+
+    def get_type(self, node: int):
+        kinds = self._kinds if self.kind is None else self.kind
+        return REQUIREMENT_TYPES[kinds[node]]
+
+    def freeze(self, root: int):
+        # Moves the nodes into arrays, after which the tree can no longer be changed
+        self.kind = np.array(self._kinds, dtype=np.int8)
+        self.parent = np.array(self._parents, dtype=np.int32)
+        self.ordinal = np.array(self._ordinals, dtype=np.int32)
+        self.refinement_kind = np.array(self._refinement_kinds, dtype=np.int8)
+        self.parameter_context = np.array(self._parameter_contexts, dtype=np.int32)
+        self.first_child = np.zeros(len(self._children) + 1, dtype=np.int64)
+        self.first_child[1:] = np.cumsum([len(children) for children in self._children])
+        self.children = np.fromiter((child for children in self._children for child in children), dtype=np.int32, count=self.first_child[-1])
+        # Parents of node i are parents[first_parent[i]:first_parent[i + 1]], once per parent like the children
+        sources = np.repeat(np.arange(len(self._children), dtype=np.int32), np.diff(self.first_child))
+        edges = np.unique(np.column_stack([self.children, sources]), axis=0).reshape(-1, 2)
+        self.first_parent = np.zeros(len(self._children) + 1, dtype=np.int64)
+        self.first_parent[1:] = np.cumsum(np.bincount(edges[:, 0], minlength=len(self._children)))
+        self.parents = edges[:, 1].astype(np.int32)
+        self.root = root
+        self._views = [None] * len(self._kinds)
+        del self._kinds, self._parents, self._ordinals, self._refinement_kinds, self._parameter_contexts, self._children
+        return self
+
+    def get_size(self):
+        return self.kind.size
+
+    def get_node(self, node: int) -> Requirement:
+        # Views are created on first access and reused
+        view = self._views[node]
+        if view is None:
+            view = VIEW_TYPES[self.kind[node]](self, node)
+            self._views[node] = view
+        return view
+
+    def get_root(self) -> Requirement:
+        return self.get_node(self.root)
+
+    def get_children(self, node: int) -> List[int]:
+        if self.children is None:
+            return list(self._children[node])
+        return self.children[self.first_child[node]:self.first_child[node + 1]].tolist()
+
+    def get_parents(self, node: int) -> List[int]:
+        return self.parents[self.first_parent[node]:self.first_parent[node + 1]].tolist()
+
+    def get_symbol(self, node: int):
+        return SYMBOL_PREFIXES[self.kind[node]] + str(self.ordinal[node])
+
+    def get_preorder(self, node: int, unique: bool = False):
+        # Ids of the subtree in preorder, with unique shared nodes only at their first reference
+        visited = np.zeros(self.get_size(), dtype=bool) if unique else None
+        preorder = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if unique:
+                if visited[node]:
+                    continue
+                visited[node] = True
+            preorder.append(node)
+            stack.extend(self.children[self.first_child[node]:self.first_child[node + 1]][::-1].tolist())
+        return np.array(preorder, dtype=np.int32)
+
+    def iterate(self, node: int, requirement_type: type = None) -> Generator[Requirement]:
+        for node in self.get_preorder(node).tolist():
+            view = self.get_node(node)
+            if requirement_type is None or isinstance(view, requirement_type):
+                yield view
+
+
+class CompactRequirementIndex:
+    # Same as RequirementIndex, kept in arrays of node ids
+    def __init__(self, tree: CompactSafetyConceptTree, node: int):
+        self.tree = tree
+        self.preorder = tree.get_preorder(node, unique=True)
+        # A tree has one reference less than nodes, any further reference is to a shared subtree
+        self.shared = int(np.sum(tree.first_child[self.preorder + 1] - tree.first_child[self.preorder])) >= self.preorder.size
+        kinds = tree.kind[self.preorder]
+        self.positions = [np.flatnonzero(kinds == kind) for kind in range(len(REQUIREMENT_TYPES))]
+        self.contained = np.zeros(tree.get_size(), dtype=bool)
+        self.contained[self.preorder] = True
+        # Node ids of every kind by the number in their symbol
+        self.symbols = [np.flatnonzero(tree.kind == kind)[np.argsort(tree.ordinal[tree.kind == kind])] for kind in range(len(REQUIREMENT_TYPES))]
+        self.names = None
+
+    def iterate(self, requirement_type: type = None) -> Iterator[Requirement]:
+        if requirement_type is None:
+            positions = np.arange(self.preorder.size)
+        else:
+            kinds = [kind for kind, view_type in enumerate(VIEW_TYPES) if issubclass(view_type, requirement_type)]
+            positions = np.sort(np.concatenate([self.positions[kind] for kind in kinds])) if kinds else np.zeros(0, dtype=np.int64)
+        return (self.tree.get_node(node) for node in self.preorder[positions].tolist())
+
+    def get_by_symbol(self, symbol: str) -> Optional[Requirement]:
+        if symbol[:1] not in SYMBOL_PREFIXES or not symbol[1:].isdigit():
+            return None
+        kind, ordinal = SYMBOL_PREFIXES.index(symbol[:1]), int(symbol[1:])
+        if not 1 <= ordinal <= self.symbols[kind].size or not self.contained[self.symbols[kind][ordinal - 1]]:
+            return None
+        return self.tree.get_node(int(self.symbols[kind][ordinal - 1]))
+
+    def get_by_name(self, name: str) -> List[Requirement]:
+        if self.names is None:
+            self.names = {}
+            for node in np.flatnonzero(self.contained).tolist():
+                if self.tree.names[node] is not None:
+                    self.names.setdefault(self.tree.names[node], []).append(node)
+        return [self.tree.get_node(node) for node in self.names.get(name, [])]
+
+
+class CompactRequirement:
+    # Properties shared by the node views of CompactSafetyConceptTree, which only hold the tree and the node id
+    __slots__ = ()
+
+    def __init__(self, tree: CompactSafetyConceptTree, index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def name(self):
+        return self.tree.names[self.index]
+
+    @property
+    def description(self):
+        return self.tree.descriptions[self.index]
+
+    @property
+    def symbol(self):
+        return self.tree.get_symbol(self.index)
+
+    @property
+    def parents(self):
+        return [self.tree.get_node(node) for node in self.tree.get_parents(self.index)]
+
+    @property
+    def revision(self):
+        # Compact trees can not be changed after parsing
+        return 0
+
+    def touch(self):
+        raise RuntimeError("Compact safety concept trees can not be changed")
+
+    def iterate(self, requirement_type: type = None) -> Iterator[Requirement]:
+        index = self._get_index()
+        if index.shared:
+            return self.tree.iterate(self.index, requirement_type)
+        return index.iterate(requirement_type)
+
+    def build_index(self) -> CompactRequirementIndex:
+        self._index = CompactRequirementIndex(self.tree, self.index)
+        return self._index
+
+
+class CompactRefinedRequirement(CompactRequirement, RefinedRequirement):
+    __slots__ = ("tree", "index")
+
+    @property
+    def refinement(self):
+        return tuple(self.tree.get_node(child) for child in self.tree.get_children(self.index))
+
+    @property
+    def refinement_kind(self):
+        refinement_kind = self.tree.refinement_kind[self.index]
+        return REFINEMENT_KINDS[refinement_kind] if refinement_kind >= 0 else None
+
+
+class CompactContextAssumption(CompactRequirement, ContextAssumption):
+    __slots__ = ("tree", "index")
+
+
+class CompactTechnicalRequirement(CompactRequirement, TechnicalRequirement):
+    __slots__ = ("tree", "index")
+
+    @property
+    def parameter_context(self):
+        parameter_context = self.tree.parameter_context[self.index]
+        return self.tree.get_node(parameter_context) if parameter_context >= 0 else None
+
+
+class CompactUndevelopedRequirement(CompactRequirement, UndevelopedRequirement):
+    __slots__ = ("tree", "index")
+
+
+class CompactEmptyRequirement(CompactRequirement, EmptyRequirement):
+    __slots__ = ("tree", "index")
+
+
+class CompactParameterContext(CompactRequirement, ParameterContext):
+    __slots__ = ("tree", "index")
+
+
+VIEW_TYPES = [
+    CompactRefinedRequirement, CompactContextAssumption, CompactTechnicalRequirement, CompactUndevelopedRequirement,
+    CompactEmptyRequirement, CompactParameterContext
+]
@@ -0,0 +1,73 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from src.model.fuzzy_inference.mamdani import MamdaniFIS
+
+
+class CachedFIS:
+    def __init__(self, fis, quantization: Optional[Dict[str, float]] = None, max_size: int = 1024, cache: str = "defuzzified"):
+        if cache not in ["defuzzified", "aggregate"]:
+            raise RuntimeError("Unknown cache mode " + cache)
+        if cache == "aggregate" and not isinstance(fis, MamdaniFIS):
+            raise RuntimeError("Only Mamdani FIS have an aggregate to cache")
+
+        self.fis = fis
+        self.quantization = quantization if quantization is not None else {}
+        self.max_size = max_size
+        self.cache = cache
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        # Outputs are dropped when the FIS is bound again, not when a membership function is changed in place
+        self._entries = OrderedDict()
+        self._version = fis.version
+
+    def compute(self, inputs: Dict[str, float]):
+        self.fis.update()
+        if self.fis.version != self._version:
+            self.invalidate()
+            self._version = self.fis.version
+
+        quantized = self._quantize(inputs)
+        key = tuple(quantized.items())
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        if self.cache == "aggregate":
+            output = self.fis.compute(quantized, defuzz=False)
+            output.flags.writeable = False  # Cached aggregates are shared between callers
+        else:
+            output = self.fis.compute(quantized)
+
+        self._entries[key] = output
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return output
+
+    def invalidate(self):
+        self._entries.clear()
+        self.invalidations += 1
+
+    def _quantize(self, inputs: Dict[str, float]):
+        # Inputs are snapped to the center of their quantization bin, so all inputs of a bin share one result
+        quantized = {}
+        for name in sorted(inputs):
+            step = self.quantization.get(name)
+            if step:
+                quantized[name] = round(inputs[name] / step) * step
+            else:
+                quantized[name] = inputs[name]
+        return quantized
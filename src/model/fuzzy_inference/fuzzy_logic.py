@@ -4,8 +4,9 @@
 # Contact: andreas.kreutz@iks.fraunhofer.de
 
 
+import re
+from functools import lru_cache
 from typing import List, Dict
-from pyparsing import infixNotation, Keyword, opAssoc, Literal, Or
 
 import numpy as np
 import skfuzzy as fuzz
@@ -15,16 +16,87 @@ from src.model.fuzzy_inference.membership_functions import get_centroid
 from settings import MAMDANI_MEMBERSHIPS
 
 
+def flatten_inputs(inputs: Dict[str, np.ndarray], names: List[str] = None):
+    # Broadcasts the inputs of a batch against each other, returns them flattened and their shape
+    names = list(inputs.keys()) if names is None else names
+    values = np.broadcast_arrays(*[np.asarray(inputs[name], dtype=float) for name in names])
+    return {name: value.ravel() for name, value in zip(names, values)}, values[0].shape
+
+
+def get_bindings(rules: List, antecedants: Dict):
+    # Objects the bound rules of a FIS depend on, compared by identity to notice when they are replaced
+    memberships = [membership for antecedant in antecedants.values() for membership in antecedant.memberships.values()]
+    return [*rules, *antecedants.values(), *memberships]
+
+
+def integrate_piecewise_linear(x: np.ndarray, y: np.ndarray):
+    # Exact area and first moment of the piecewise linear function through (x, y) along the last axis
+    x1 = x[..., :-1]
+    x2 = x[..., 1:]
+    y1 = y[..., :-1]
+    y2 = y[..., 1:]
+    area = np.sum(0.5 * (x2 - x1) * (y1 + y2), axis=-1)
+    moment_area = np.sum((x2 - x1) * (y1 * (2 * x1 + x2) + y2 * (x1 + 2 * x2)) / 6, axis=-1)
+    return area, moment_area
+
+
+def centroid_exceeds(x: np.ndarray, y: np.ndarray, threshold: float, chunk_size: int = 64):
+    # Decides centroid(x, y) >= threshold for every row of y, stopping at rows whose sign can no longer change
+    y = np.atleast_2d(y)
+    x = np.broadcast_to(x, y.shape)
+    x_end = x[:, -1]
+    partial_sum = np.zeros(y.shape[0])
+    partial_area = np.zeros(y.shape[0])
+    exceeds = np.zeros(y.shape[0], dtype=bool)
+    undecided = np.arange(y.shape[0])
+
+    for start in range(0, y.shape[1] - 1, chunk_size):
+        end = min(start + chunk_size, y.shape[1] - 1)
+        area, moment_area = integrate_piecewise_linear(x[undecided, start:end + 1], y[undecided, start:end + 1])
+        partial_sum[undecided] += moment_area - threshold * area
+        partial_area[undecided] += area
+
+        # Integral of |x - threshold| over the remaining segments left and right of the threshold
+        x_reached = x[undecided, end]
+        x_remaining = x_end[undecided]
+        max_negative = 0.5 * (np.fmax(threshold - x_reached, 0.0)**2 - np.fmax(threshold - x_remaining, 0.0)**2)
+        max_positive = 0.5 * (np.fmax(x_remaining - threshold, 0.0)**2 - np.fmax(x_reached - threshold, 0.0)**2)
+
+        decided_above = (partial_sum[undecided] - max_negative >= 0) & (partial_area[undecided] > 0)
+        decided_below = partial_sum[undecided] + max_positive < 0
+        exceeds[undecided[decided_above]] = True
+        undecided = undecided[~(decided_above | decided_below)]
+        if undecided.size == 0:
+            break
+
+    # Rows that are still undecided are empty, their centroid is 0.0 like in Consequent.defuzzify
+    exceeds[undecided] = (partial_area[undecided] > 0) & (partial_sum[undecided] >= 0) | (partial_area[undecided] == 0) & (0.0 >= threshold)
+    return exceeds
+
+
 class LinguisticVariable:
     def __init__(self, name: str, terms: List[str], universe: np.ndarray, memberships: List):
         self.name = name
         self.universe = universe
         self.memberships = {terms[i]: memberships[i] for i in range(len(terms))}
+        self._sampled_memberships = {}
+
+    def get_sampled_membership(self, term: str):
+        # Memberships are either sampled arrays or parametric functions that are only sampled on demand
+        membership = self.memberships[term]
+        if isinstance(membership, np.ndarray):
+            return membership
+        cached = self._sampled_memberships.get(term)
+        if cached is None or cached[0] is not membership:
+            cached = (membership, membership.sample(self.universe))
+            self._sampled_memberships[term] = cached
+        return cached[1]
 
     def plot(self, ax, value=None):
         ax.set_title(self.name)
         membership_values = []
-        for term, membership in self.memberships.items():
+        for term in self.memberships:
+            membership = self.get_sampled_membership(term)
             membership_value = fuzz.interp_membership(self.universe, membership, value)
             membership_values.append(str(membership_value))
             ax.plot(self.universe, membership, label=f"{term}: {membership_value}")
@@ -39,12 +111,30 @@ class LinguisticVariable:
 
 class Antecedant(LinguisticVariable):
     def get_membership_degree(self, term: str, value: float):
-        return fuzz.interp_membership(self.universe, self.memberships[term], value)
+        membership = self.memberships[term]
+        if isinstance(membership, np.ndarray):
+            return fuzz.interp_membership(self.universe, membership, value)
+        return membership(value)
+
+    def get_membership_function(self, term: str):
+        # Callable that gives the membership degree of term for a value or an array of values
+        membership = self.memberships[term]
+        if isinstance(membership, np.ndarray):
+            universe = self.universe
+            return lambda value: fuzz.interp_membership(universe, membership, value)
+        return membership
 
 
 class Consequent(LinguisticVariable):
+    def __init__(self, name: str, terms: List[str], universe: np.ndarray, memberships: List):
+        super().__init__(name, terms, universe, memberships)
+        self._analytic_geometry = None
+
     def get_activation(self, term: str, value: float):
-        return np.fmin(self.memberships[term], value)
+        return np.fmin(self.get_sampled_membership(term), value)
+
+    def get_activations(self, term: str, values: np.ndarray):
+        return np.fmin(self.get_sampled_membership(term)[np.newaxis, :], np.asarray(values, dtype=float)[:, np.newaxis])
 
     def defuzzify(self, aggregate):
         try:
@@ -52,28 +142,163 @@ class Consequent(LinguisticVariable):
         except fuzz.EmptyMembershipError:
             return 0.0
 
+    def defuzzify_batch(self, aggregates: np.ndarray):
+        # Same piecewise linear centroid as fuzz.defuzz, computed for all rows of aggregates at once
+        area, moment_area = integrate_piecewise_linear(self.universe, aggregates)
+        empty = np.sum(aggregates, axis=-1) == 0
+        return np.where(empty, 0.0, moment_area / np.fmax(area, np.finfo(float).eps))
+
+    def exceeds(self, aggregate: np.ndarray, threshold: float):
+        # Same as defuzzify(aggregate) >= threshold, also for a batch of aggregates in the rows of aggregate
+        exceeds = centroid_exceeds(self.universe, np.reshape(aggregate, (-1, self.universe.size)), threshold)
+        if np.ndim(aggregate) == 1:
+            return bool(exceeds[0])
+        return exceeds.reshape(np.shape(aggregate)[:-1])
+
+    def get_centroid(self, term_weights: Dict[str, float]):
+        points, aggregate, shape = self._get_analytic_aggregate(term_weights)
+        area, moment_area = integrate_piecewise_linear(points, aggregate)
+        centroid = np.where(area > 0, moment_area / np.fmax(area, np.finfo(float).eps), 0.0).reshape(shape)
+        if centroid.ndim == 0:
+            return float(centroid)
+        return centroid
+
+    def centroid_exceeds(self, term_weights: Dict[str, float], threshold: float):
+        # Same as get_centroid(term_weights) >= threshold
+        points, aggregate, shape = self._get_analytic_aggregate(term_weights)
+        exceeds = centroid_exceeds(points, aggregate, threshold, chunk_size=8).reshape(shape)
+        if exceeds.ndim == 0:
+            return bool(exceeds)
+        return exceeds
+
+    def _get_analytic_aggregate(self, term_weights: Dict[str, float]):
+        # Aggregate at the breakpoints, crossings and weight levels of the memberships, between which it is linear
+        terms = list(self.memberships.keys())
+        weights = np.broadcast_arrays(*[np.asarray(term_weights.get(term, 0.0), dtype=float) for term in terms])
+        shape = weights[0].shape
+        weights = np.stack([weight.ravel() for weight in weights], axis=-1)
+
+        fixed_points, ramps = self._get_analytic_geometry()
+        # For every ramp (start, end, level at start, level at end) the point where it reaches each weight
+        starts, ends, levels_start, levels_end = ramps
+        fraction = (weights[:, np.newaxis, :] - levels_start[:, np.newaxis]) / (levels_end - levels_start)[:, np.newaxis]
+        level_points = starts[:, np.newaxis] + np.clip(fraction, 0.0, 1.0) * (ends - starts)[:, np.newaxis]
+
+        points = np.concatenate([
+            np.broadcast_to(fixed_points, (weights.shape[0], fixed_points.size)), level_points.reshape(weights.shape[0], -1)
+        ], axis=1)
+        points = np.sort(np.clip(points, self.universe[0], self.universe[-1]), axis=1)
+
+        aggregate = np.zeros_like(points)
+        for i, term in enumerate(terms):
+            np.fmax(aggregate, np.fmin(self.memberships[term](points), weights[:, i:i + 1]), out=aggregate)
+        return points, aggregate, shape
+
+    def _get_analytic_geometry(self):
+        memberships = list(self.memberships.values())
+        if not all(hasattr(membership, "breakpoints") for membership in memberships):
+            raise RuntimeError("Analytic defuzzification of " + self.name + " requires parametric memberships")
+        if self._analytic_geometry is not None and self._analytic_geometry[0] == memberships:
+            return self._analytic_geometry[1]
+
+        breakpoints = np.unique(np.clip(
+            [self.universe[0], self.universe[-1]] + [point for membership in memberships for point in membership.breakpoints],
+            self.universe[0], self.universe[-1]
+        ))
+        # Memberships are linear between consecutive breakpoints, so two of them cross at most once in between
+        crossings = []
+        for x1, x2 in zip(breakpoints[:-1], breakpoints[1:]):
+            inner = np.array([x1 + (x2 - x1) * 1e-9, x2 - (x2 - x1) * 1e-9])
+            values = [membership(inner) for membership in memberships]
+            for i in range(len(values)):
+                for j in range(i + 1, len(values)):
+                    difference = values[i] - values[j]
+                    if difference[0] * difference[1] < 0:
+                        crossings.append(inner[0] + (inner[1] - inner[0]) * difference[0] / (difference[0] - difference[1]))
+
+        ramps = []
+        for membership in memberships:
+            a, b, c, d = membership.breakpoints
+            if b > a:
+                ramps.append((a, b, 0.0, 1.0))
+            if d > c:
+                ramps.append((c, d, 1.0, 0.0))
+        ramps = tuple(np.array([ramp[i] for ramp in ramps], dtype=float) for i in range(4))
+
+        geometry = (np.concatenate([breakpoints, crossings]), ramps)
+        self._analytic_geometry = (memberships, geometry)
+        return geometry
+
+
+OPERATORS = ["is", "not", "and", "or"]
+
+
+class AntecedantParser:
+    # Precedence parser for antecedant terms that produces the nested lists of a pyparsing infixNotation
+    def __init__(self, antecedant_term: str):
+        self.antecedant_term = antecedant_term
+        self.tokens = re.findall(r"\(|\)|[^\s()]+", antecedant_term)
+        self.position = 0
+
+    def parse(self):
+        term = self._parse_or()
+        if self.position != len(self.tokens):
+            raise RuntimeError(f"Unexpected {self.tokens[self.position]} in antecedant term {self.antecedant_term}")
+        return term
+
+    def _parse_or(self):
+        return self._parse_chain("or", self._parse_and)
+
+    def _parse_and(self):
+        return self._parse_chain("and", self._parse_not)
+
+    def _parse_not(self):
+        if self._peek() == "not":
+            return [self._next(), self._parse_not()]
+        return self._parse_chain("is", self._parse_operand)
+
+    def _parse_chain(self, operator, parse_operand):
+        term = [parse_operand()]
+        while self._peek() == operator:
+            term.append(self._next())
+            term.append(parse_operand())
+        return term[0] if len(term) == 1 else term
+
+    def _parse_operand(self):
+        token = self._next()
+        if token == "(":
+            term = self._parse_or()
+            if self._next() != ")":
+                raise RuntimeError("Missing closing parenthesis in antecedant term " + self.antecedant_term)
+            return term
+        elif token is None or token == ")" or token in OPERATORS:
+            raise RuntimeError(f"Unexpected {token} in antecedant term {self.antecedant_term}")
+        return token
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self):
+        token = self._peek()
+        self.position += 1
+        return token
+
+
+@lru_cache(maxsize=65536)
+def parse_antecedant_term(antecedant_term: str):
+    # Rules with the same antecedant share the parse result and the compiled evaluator
+    parsed = AntecedantParser(antecedant_term).parse()
+    return parsed, Rule._compile(parsed)
+
 
 class Rule:
     def __init__(self, antecedant_term: str):
         self.antecedant_term_str = antecedant_term
+        self.antecedant_term, self.bind_antecedants = parse_antecedant_term(antecedant_term)
 
-        literals = self._get_literals(antecedant_term)
-        
-        is_op = Keyword("is")
-        not_op = Keyword("not")
-        and_op = Keyword("and")
-        or_op = Keyword("or")
-
-        expr = infixNotation(
-            Or(Literal(literal) for literal in literals),
-            [
-                (is_op, 2, opAssoc.LEFT),
-                (not_op, 1, opAssoc.RIGHT),
-                (and_op, 2, opAssoc.LEFT),
-                (or_op, 2, opAssoc.LEFT)
-            ]
-        )
-        self.antecedant_term = expr.parseString(antecedant_term)[0]
+    def evaluate_antecedants(self, inputs: Dict[str, float], antecedants: Dict[str, Antecedant]):
+        # Binds the rule on every call, a FIS binds its rules once with bind_antecedants instead
+        return self.bind_antecedants(antecedants)(inputs)
 
     def evaluate_antecedant_term(self, antecedant_term, inputs: Dict[str, float], antecedants: Dict[str, Antecedant]):
         if len(antecedant_term) == 2:
@@ -92,10 +317,49 @@ class Rule:
             else:
                 raise RuntimeError("Unknown operator " + antecedant_term[1])
             
-    def _get_literals(self, expression: str):
-        words = expression.split(" ")
-        words = [word.replace("(", "").replace(")", "") for word in words]
-        return list(filter(lambda word: word not in ["and", "or", "not", "is"], words))        
+    @staticmethod
+    def _compile(antecedant_term):
+        # Turns the parsed term into nested closures that are bound to the membership functions of a FIS
+        if len(antecedant_term) == 2:
+            bind_operand = Rule._compile(antecedant_term[1])
+
+            def bind(antecedants):
+                operand = bind_operand(antecedants)
+                return lambda inputs: 1 - operand(inputs)
+            return bind
+        elif antecedant_term[1] == "is":
+            name, _, term = antecedant_term
+
+            def bind(antecedants):
+                membership = antecedants[name].get_membership_function(term)
+                return lambda inputs: membership(inputs[name])
+            return bind
+
+        # The grammar groups chains of the same operator, e.g. a and b and c, into one flat term
+        if antecedant_term[1] == "and":
+            operator = np.fmin
+        elif antecedant_term[1] == "or":
+            operator = np.fmax
+        else:
+            raise RuntimeError("Unknown operator " + antecedant_term[1])
+
+        bind_operands = [Rule._compile(operand) for operand in antecedant_term[::2]]
+
+        def bind(antecedants):
+            operands = [bind_operand(antecedants) for bind_operand in bind_operands]
+            if len(operands) == 2:
+                left, right = operands
+                return lambda inputs: operator(left(inputs), right(inputs))
+
+            first, rest = operands[0], operands[1:]
+
+            def evaluate(inputs):
+                weight = first(inputs)
+                for operand in rest:
+                    weight = operator(weight, operand(inputs))
+                return weight
+            return evaluate
+        return bind
 
     def __str__(self):
         return self.antecedant_term_str
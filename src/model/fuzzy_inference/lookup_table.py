@@ -0,0 +1,113 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+from itertools import product
+from typing import Dict, List
+
+import numpy as np
+
+from src.model.fuzzy_inference.fuzzy_logic import flatten_inputs
+from src.utils.npz import load_npz
+
+
+class LookupTable:
+    def __init__(self, names: List[str], lower: np.ndarray, upper: np.ndarray, table: np.ndarray, max_error: float = np.nan):
+        self.names = list(names)
+        self.lower = [float(value) for value in lower]
+        self.upper = [float(value) for value in upper]
+        self.table = table
+        self.max_error = float(max_error)
+
+        self._steps = [(u - l) / (n - 1) for l, u, n in zip(self.lower, self.upper, table.shape)]
+        self._strides = [int(np.prod(table.shape[i + 1:])) for i in range(table.ndim)]
+        self._flat_table = table.reshape(-1)
+        self._flat_values = memoryview(np.ascontiguousarray(self._flat_table, dtype=float)).cast("B").cast("d")
+        # Flat offsets and dimensions of the 2^d corners of a grid cell, relative to its lowest corner
+        self._corners = [
+            (sum(stride for stride, c in zip(self._strides, corner) if c), corner) for corner in product([0, 1], repeat=table.ndim)
+        ]
+
+    def get_axes(self):
+        return {name: np.linspace(l, u, n) for name, l, u, n in zip(self.names, self.lower, self.upper, self.table.shape)}
+
+    def compute(self, inputs: Dict[str, float]):
+        # Multilinear interpolation in the grid cell of the input, inputs outside of the grid are clamped
+        offset = 0
+        fractions = []
+        for name, lower, step, stride, n in zip(self.names, self.lower, self._steps, self._strides, self.table.shape):
+            position = min(max((inputs[name] - lower) / step, 0.0), n - 1.0)
+            index = min(int(position), n - 2)
+            offset += index * stride
+            fractions.append(position - index)
+
+        result = 0.0
+        for corner_offset, corner in self._corners:
+            weight = 1.0
+            for fraction, c in zip(fractions, corner):
+                weight *= fraction if c else 1.0 - fraction
+            result += weight * self._flat_values[offset + corner_offset]
+        return result
+
+    def compute_batch(self, inputs: Dict[str, np.ndarray]):
+        flat_inputs, shape = flatten_inputs(inputs, self.names)
+        size = int(np.prod(shape))
+
+        offsets = np.zeros(size, dtype=np.int64)
+        fractions = []
+        for name, lower, step, stride, n in zip(self.names, self.lower, self._steps, self._strides, self.table.shape):
+            position = np.clip((flat_inputs[name] - lower) / step, 0.0, n - 1.0)
+            index = np.minimum(position.astype(np.int64), n - 2)
+            offsets += index * stride
+            fractions.append(position - index)
+
+        result = np.zeros(size)
+        for corner_offset, corner in self._corners:
+            weight = np.ones(size)
+            for fraction, c in zip(fractions, corner):
+                weight *= fraction if c else 1.0 - fraction
+            result += weight * self._flat_table[offsets + corner_offset]
+        return result.reshape(shape)
+
+    def measure_error(self, fis, n_samples: int = 100000, seed: int = 0):
+        # Largest deviation from the exact FIS at the centers of all grid cells and at uniformly drawn inputs
+        axes = self.get_axes()
+        centers = [(axes[name][:-1] + axes[name][1:]) / 2 for name in self.names]
+        n_centers = int(np.prod([center.size for center in centers]))
+        if n_centers <= n_samples:
+            inputs = dict(zip(self.names, np.meshgrid(*centers, indexing="ij")))
+            self.max_error = float(np.max(np.abs(self.compute_batch(inputs) - fis.compute_batch(inputs))))
+        else:
+            self.max_error = 0.0
+
+        rng = np.random.default_rng(seed)
+        inputs = {name: rng.uniform(lower, upper, n_samples) for name, lower, upper in zip(self.names, self.lower, self.upper)}
+        self.max_error = max(self.max_error, float(np.max(np.abs(self.compute_batch(inputs) - fis.compute_batch(inputs)))))
+        return self.max_error
+
+    def save(self, path):
+        np.savez(
+            path, names=np.array(self.names), lower=np.array(self.lower), upper=np.array(self.upper),
+            table=np.ascontiguousarray(self.table), max_error=np.array(self.max_error)
+        )
+
+
+def tabulate_fis(fis, grid: Dict[str, int], measure_error=True):
+    # Evaluates the FIS on a uniform grid with grid[name] points over the universe of every antecedant
+    names = list(grid.keys())
+    lower = [fis.antecedants[name].universe[0] for name in names]
+    upper = [fis.antecedants[name].universe[-1] for name in names]
+    axes = [np.linspace(l, u, grid[name]) for name, l, u in zip(names, lower, upper)]
+
+    table = fis.compute_batch(dict(zip(names, np.meshgrid(*axes, indexing="ij"))))
+    lookup_table = LookupTable(names, lower, upper, table)
+    if measure_error:
+        lookup_table.measure_error(fis)
+    return lookup_table
+
+
+def load_lookup_table(path, mmap=True):
+    data = load_npz(path, mmap=mmap)
+    return LookupTable([str(name) for name in data["names"]], data["lower"], data["upper"], data["table"], data["max_error"])
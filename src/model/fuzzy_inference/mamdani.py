@@ -9,7 +9,7 @@ from typing import Dict, List
 import numpy as np
 from matplotlib import pyplot as plt
 
-from src.model.fuzzy_inference.fuzzy_logic import Antecedant, Consequent, Rule
+from src.model.fuzzy_inference.fuzzy_logic import Antecedant, Consequent, Rule, flatten_inputs, get_bindings
 
 
 class MamdaniRule(Rule):
@@ -18,8 +18,12 @@ class MamdaniRule(Rule):
         self.consequent_term = consequent_term
 
     def evaluate(self, inputs: Dict[str, float], antecedants: Dict[str, Antecedant], consequent: Consequent):
-        weight = super().evaluate_antecedant_term(self.antecedant_term, inputs, antecedants)
+        weight = self.evaluate_antecedants(inputs, antecedants)
         return consequent.get_activation(self.consequent_term, weight)
+
+    def evaluate_batch(self, inputs: Dict[str, np.ndarray], antecedants: Dict[str, Antecedant], consequent: Consequent):
+        weights = self.evaluate_antecedants(inputs, antecedants)
+        return consequent.get_activations(self.consequent_term, weights)
             
 
 class MamdaniFIS:
@@ -27,8 +31,36 @@ class MamdaniFIS:
         self.antecedants = {antecedant.name: antecedant for antecedant in antecedants}
         self.consequent = consequent
         self.rules = rules
+        self.version = 0
+        self.bind()
+
+    def bind(self):
+        # Binds the antecedants of all rules to their membership functions, the version tells caches of outputs
+        self._bindings = get_bindings(self.rules, self.antecedants)
+        self._rule_antecedants = [rule.bind_antecedants(self.antecedants) for rule in self.rules]
+        self.version += 1
+
+    def update(self):
+        # Binds again if rules, antecedants or memberships were added, removed or replaced since the last bind
+        bindings = get_bindings(self.rules, self.antecedants)
+        if len(bindings) != len(self._bindings) or any(a is not b for a, b in zip(bindings, self._bindings)):
+            self.bind()
+
+    def get_term_weights(self, inputs: Dict[str, float]):
+        self.update()
+        term_weights = {}
+        for rule, evaluate_antecedants in zip(self.rules, self._rule_antecedants):
+            weight = evaluate_antecedants(inputs)
+            if rule.consequent_term in term_weights:
+                weight = np.fmax(term_weights[rule.consequent_term], weight)
+            term_weights[rule.consequent_term] = weight
+        return term_weights
+
+    def compute(self, inputs: Dict[str, float], defuzz=True, plot=False, analytic=False):
+        self.update()
+        if analytic and defuzz and not plot:
+            return self.consequent.get_centroid(self.get_term_weights(inputs))
 
-    def compute(self, inputs: Dict[str, float], defuzz=True, plot=False):
         if plot:
             n_columns = max(3, len(self.antecedants) + 1)
             _, axes = plt.subplots(2, n_columns, sharey=True)
@@ -40,8 +72,8 @@ class MamdaniFIS:
             axes[1][0].set_title("Activations")
 
         aggregate = None
-        for rule in self.rules:
-            activation = rule.evaluate(inputs, self.antecedants, self.consequent)
+        for rule, evaluate_antecedants in zip(self.rules, self._rule_antecedants):
+            activation = self.consequent.get_activation(rule.consequent_term, evaluate_antecedants(inputs))
             if aggregate is None:
                 aggregate = activation
             else:
@@ -51,7 +83,13 @@ class MamdaniFIS:
                 label = f"{rule.consequent_term}, if {rule}"
                 axes[1][0].plot(self.consequent.universe, activation, label=label)
 
-        defuzzified = self.consequent.defuzzify(aggregate)
+        if not defuzz and not plot:
+            return aggregate
+
+        if analytic:
+            defuzzified = self.consequent.get_centroid(self.get_term_weights(inputs))
+        else:
+            defuzzified = self.consequent.defuzzify(aggregate)
 
         if plot:
             axes[1][0].legend(loc="upper left")
@@ -64,3 +102,35 @@ class MamdaniFIS:
             return defuzzified
         else:
             return aggregate
+
+    def compute_batch(self, inputs: Dict[str, np.ndarray], defuzz=True, analytic=False):
+        self.update()
+        flat_inputs, shape = flatten_inputs(inputs)
+
+        if analytic and defuzz:
+            return np.reshape(self.consequent.get_centroid(self.get_term_weights(flat_inputs)), shape)
+
+        aggregate = None
+        for rule, evaluate_antecedants in zip(self.rules, self._rule_antecedants):
+            activation = self.consequent.get_activations(rule.consequent_term, evaluate_antecedants(flat_inputs))
+            if aggregate is None:
+                aggregate = activation
+            else:
+                aggregate = np.fmax(aggregate, activation, out=aggregate)
+
+        if defuzz:
+            return self.consequent.defuzzify_batch(aggregate).reshape(shape)
+        else:
+            return aggregate.reshape(shape + self.consequent.universe.shape)
+
+    def is_above(self, inputs: Dict[str, float], threshold: float, analytic=False):
+        # Same decision as compute(inputs) >= threshold, without computing the centroid itself
+        if analytic:
+            return self.consequent.centroid_exceeds(self.get_term_weights(inputs), threshold)
+        return self.consequent.exceeds(self.compute(inputs, defuzz=False), threshold)
+
+    def is_above_batch(self, inputs: Dict[str, np.ndarray], threshold: float, analytic=False):
+        if analytic:
+            flat_inputs, shape = flatten_inputs(inputs)
+            return np.reshape(self.consequent.centroid_exceeds(self.get_term_weights(flat_inputs), threshold), shape)
+        return self.consequent.exceeds(self.compute_batch(inputs, defuzz=False), threshold)
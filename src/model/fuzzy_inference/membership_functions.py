@@ -4,7 +4,45 @@
 # Contact: andreas.kreutz@iks.fraunhofer.de
 
 
-from skfuzzy import trimf, trapmf
+from numbers import Number
+
+import numpy as np
+
+
+class TrapezoidalMembership:
+    def __init__(self, a, b, c, d):
+        self.breakpoints = (a, b, c, d)
+        # Corners of the trapezoid without the duplicates of shoulders and triangles, for np.interp
+        corners = [(a, 0.0), (b, 1.0), (c, 1.0), (d, 0.0)]
+        if a == b:
+            corners.remove((a, 0.0))
+        if b == c:
+            corners.remove((c, 1.0))
+        if c == d:
+            corners.remove((d, 0.0))
+        self._x, self._y = [np.array(values, dtype=float) for values in zip(*corners)]
+
+    def __call__(self, x):
+        # Closed form of trapmf, zero outside [a, d] like interp_membership outside the universe
+        a, b, c, d = self.breakpoints
+        if isinstance(x, Number):
+            if x < a or x > d:
+                return 0.0
+            elif x < b:
+                return (x - a) / (b - a)
+            elif x <= c:
+                return 1.0
+            else:
+                return (d - x) / (d - c)
+        return np.interp(x, self._x, self._y, left=0.0, right=0.0)
+
+    def sample(self, universe):
+        return self(universe)
+
+
+class TriangularMembership(TrapezoidalMembership):
+    def __init__(self, a, b, c):
+        super().__init__(a, b, b, c)
 
 
 def get_partitions(universe, partitions):
@@ -30,20 +68,20 @@ def get_intervals(universe, shape):
         ]
 
 
-def get_membership_functions(universe, shape):
+def get_parametric_membership_functions(universe, shape):
     if shape == "triangle":
         partitions = get_partitions(universe, [0, 1/2, 1])
         return [
-            trimf(universe, [partitions[0], partitions[0], partitions[1]]),
-            trimf(universe, [partitions[0], partitions[1], partitions[2]]),
-            trimf(universe, [partitions[1], partitions[2], partitions[2]])
+            TriangularMembership(partitions[0], partitions[0], partitions[1]),
+            TriangularMembership(partitions[0], partitions[1], partitions[2]),
+            TriangularMembership(partitions[1], partitions[2], partitions[2])
         ]
     elif shape == "trapezoid":
         partitions = get_partitions(universe, [0, 1/4, 1/2, 3/4, 1])
         return [
-            trapmf(universe, [partitions[0], partitions[0], partitions[1], partitions[2]]),
-            trimf(universe, [partitions[1], partitions[2], partitions[3]]),
-            trapmf(universe, [partitions[2], partitions[3], partitions[4], partitions[4]])
+            TrapezoidalMembership(partitions[0], partitions[0], partitions[1], partitions[2]),
+            TriangularMembership(partitions[1], partitions[2], partitions[3]),
+            TrapezoidalMembership(partitions[2], partitions[3], partitions[4], partitions[4])
         ]
 
 
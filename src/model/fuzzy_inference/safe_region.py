@@ -0,0 +1,106 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+from itertools import product
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+class SafeRegion:
+    def __init__(self, names, lower, upper, n_cells, safe_cells, boundary_cells, vertices, vertices_safe):
+        # Cells are (lower corner, size) in integer units of the finest grid with n_cells cells per axis
+        self.names = names
+        self.lower = lower
+        self.upper = upper
+        self.n_cells = n_cells
+        self.safe_cells = safe_cells
+        self.boundary_cells = boundary_cells
+        self.vertices = vertices
+        self.vertices_safe = vertices_safe
+
+    @property
+    def n_evaluations(self):
+        return len(self.vertices)
+
+    def get_resolution(self):
+        return (self.upper - self.lower) / self.n_cells
+
+    def to_inputs(self, indices):
+        return self.lower + np.asarray(indices) * self.get_resolution()
+
+    def get_safe_intervals(self):
+        # Smallest and largest value of every input among the safe grid points, like get_safe_intervals on a full grid
+        safe_vertices = self.to_inputs(self.vertices[self.vertices_safe])
+        if safe_vertices.size == 0:
+            return {name: (np.nan, np.nan) for name in self.names}
+        return {name: (np.min(safe_vertices[:, i]), np.max(safe_vertices[:, i])) for i, name in enumerate(self.names)}
+
+    def get_safe_boxes(self):
+        # Lower and upper input corners of the cells whose corners are all safe
+        corners, sizes = self.safe_cells
+        return self.to_inputs(corners), self.to_inputs(corners + sizes[:, np.newaxis])
+
+
+def is_above(fis, inputs, threshold, analytic=False):
+    if hasattr(fis, "is_above_batch"):
+        return fis.is_above_batch(inputs, threshold, analytic=analytic)
+    return np.greater_equal(fis.compute_batch(inputs), threshold)
+
+
+def extract_safe_region(fis, threshold: float, resolution: Dict[str, float], bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+                        fixed_inputs: Optional[Dict[str, float]] = None, initial_cells: int = 4, analytic=False):
+    # Finds the inputs with output >= threshold by splitting the cells whose corners disagree on the threshold
+    names = list(resolution.keys())
+    if bounds is None:
+        bounds = {name: (fis.antecedants[name].universe[0], fis.antecedants[name].universe[-1]) for name in names}
+    if fixed_inputs is None:
+        fixed_inputs = {}
+    lower = np.array([bounds[name][0] for name in names], dtype=float)
+    upper = np.array([bounds[name][1] for name in names], dtype=float)
+    step = np.array([resolution[name] for name in names], dtype=float)
+
+    depth = int(max(0, np.max(np.ceil(np.log2((upper - lower) / (step * initial_cells))))))
+    n_cells = initial_cells * 2**depth
+    dimensions = len(names)
+    offsets = np.array(list(product([0, 1], repeat=dimensions)), dtype=np.int64)
+
+    known = {}
+    size = 2**depth
+    cells = np.array(list(product(range(initial_cells), repeat=dimensions)), dtype=np.int64) * size
+    safe_cells = []
+    boundary_cells = []
+    while cells.size > 0:
+        corners = cells[:, np.newaxis, :] + offsets[np.newaxis, :, :] * size
+        keys = np.ravel_multi_index(corners.reshape(-1, dimensions).T, (n_cells + 1,) * dimensions)
+
+        # Every grid point is evaluated once, all new points of a level in one batch
+        new_keys = np.array([key for key in np.unique(keys) if key not in known], dtype=np.int64)
+        if new_keys.size > 0:
+            new_vertices = np.stack(np.unravel_index(new_keys, (n_cells + 1,) * dimensions), axis=1)
+            inputs = lower + new_vertices * (upper - lower) / n_cells
+            safe = is_above(fis, {**{name: inputs[:, i] for i, name in enumerate(names)}, **fixed_inputs}, threshold, analytic)
+            known.update(zip(new_keys.tolist(), np.broadcast_to(safe, new_keys.shape).tolist()))
+
+        corners_safe = np.array([known[key] for key in keys.tolist()], dtype=bool).reshape(-1, 2**dimensions)
+        all_safe = np.all(corners_safe, axis=1)
+        mixed = np.any(corners_safe, axis=1) & ~all_safe
+        safe_cells.append((cells[all_safe], np.full(np.sum(all_safe), size, dtype=np.int64)))
+
+        if size == 1:
+            boundary_cells.append(cells[mixed])
+            break
+        size //= 2
+        cells = (cells[mixed][:, np.newaxis, :] + offsets[np.newaxis, :, :] * size).reshape(-1, dimensions)
+
+    vertices = np.stack(np.unravel_index(np.fromiter(known.keys(), dtype=np.int64, count=len(known)), (n_cells + 1,) * dimensions), axis=1)
+    vertices_safe = np.fromiter(known.values(), dtype=bool, count=len(known))
+    safe_cells = (
+        np.concatenate([corners for corners, _ in safe_cells]).reshape(-1, dimensions),
+        np.concatenate([sizes for _, sizes in safe_cells])
+    )
+    boundary_cells = np.concatenate(boundary_cells).reshape(-1, dimensions) if boundary_cells else np.zeros((0, dimensions), dtype=np.int64)
+    return SafeRegion(names, lower, upper, n_cells, safe_cells, boundary_cells, vertices, vertices_safe)
@@ -6,9 +6,10 @@
 
 from typing import List, Dict
 
+import numpy as np
 from matplotlib import pyplot as plt
 
-from src.model.fuzzy_inference.fuzzy_logic import Antecedant, Consequent, Rule
+from src.model.fuzzy_inference.fuzzy_logic import Antecedant, Consequent, Rule, flatten_inputs, get_bindings
 
 
 class Function:
@@ -27,10 +28,15 @@ class Polynomial:
 
     def evaluate(self, inputs: Dict[str, float]):
         result = self.factors.get("Constant", 0)
-        for name, value in inputs.items():
-            result += self.factors.get(name, 0) * value
+        for name, factor in self.factors.items():
+            if name != "Constant" and name in inputs:
+                result += factor * inputs[name]
         return result
 
+    def get_coefficients(self, names: List[str]):
+        # Coefficients ordered like names, followed by the constant
+        return np.array([self.factors.get(name, 0) for name in names] + [self.factors.get("Constant", 0)], dtype=float)
+
 
 class SugenoRule(Rule):
     def __init__(self, antecedant_term: str, consequent_polynomial: Polynomial):
@@ -38,18 +44,36 @@ class SugenoRule(Rule):
         self.consequent_polynomial = consequent_polynomial
 
     def evaluate(self, inputs: Dict[str, float], antecedants: Dict[str, Antecedant]):
-        weight = super().evaluate_antecedant_term(self.antecedant_term, inputs, antecedants)
+        weight = self.evaluate_antecedants(inputs, antecedants)
         activation = self.consequent_polynomial.evaluate(inputs)
         return activation, weight
 
+    def evaluate_weight(self, inputs: Dict[str, np.ndarray], antecedants: Dict[str, Antecedant]):
+        return self.evaluate_antecedants(inputs, antecedants)
+
 
 class SugenoFIS:
     def __init__(self, antecedants: List[Antecedant], consequent: Consequent, rules: List[SugenoRule]):
         self.antecedants = {antecedant.name: antecedant for antecedant in antecedants}
         self.consequent = consequent
         self.rules = rules
+        self.version = 0
+        self.bind()
+
+    def bind(self):
+        # Binds the antecedants of all rules to their membership functions, the version tells caches of outputs
+        self._bindings = get_bindings(self.rules, self.antecedants)
+        self._rule_antecedants = [rule.bind_antecedants(self.antecedants) for rule in self.rules]
+        self.version += 1
+
+    def update(self):
+        # Binds again if rules, antecedants or memberships were added, removed or replaced since the last bind
+        bindings = get_bindings(self.rules, self.antecedants)
+        if len(bindings) != len(self._bindings) or any(a is not b for a, b in zip(bindings, self._bindings)):
+            self.bind()
 
     def compute(self, inputs: Dict[str, float], plot=False):
+        self.update()
         if plot:
             n_columns = max(2, len(self.antecedants))
             _, axes = plt.subplots(2, n_columns)
@@ -59,13 +83,18 @@ class SugenoFIS:
             axes[1][0].set_title("Activations")
         aggregate = 0
         weights_sum = 0
-        for rule in self.rules:
-            activation, weight = rule.evaluate(inputs, self.antecedants)
+        for rule, evaluate_antecedants in zip(self.rules, self._rule_antecedants):
+            activation = rule.consequent_polynomial.evaluate(inputs)
+            weight = evaluate_antecedants(inputs)
             aggregate = aggregate + activation * weight
             weights_sum += weight
             if plot:
                 axes[1][0].plot([activation, activation], [0.0, weight], label=str(rule))
-        aggregate = aggregate / weights_sum
+        if weights_sum == 0:
+            # No rule fires, return 0.0 like Consequent.defuzzify does for an empty aggregate
+            aggregate = 0.0
+        else:
+            aggregate = aggregate / weights_sum
 
         if plot:
             axes[1][0].plot([aggregate, aggregate], [0.0, 1.0], label="Aggregate")
@@ -73,3 +102,21 @@ class SugenoFIS:
             axes[1][0].legend()
 
         return aggregate
+
+    def compute_batch(self, inputs: Dict[str, np.ndarray]):
+        self.update()
+        flat_inputs, shape = flatten_inputs(inputs)
+        names = list(flat_inputs.keys())
+        size = int(np.prod(shape))
+
+        # (N, inputs + 1) times (inputs + 1, rules) gives all rule outputs at once
+        x = np.column_stack([flat_inputs[name] for name in names] + [np.ones(size)])
+        coefficients = np.column_stack([rule.consequent_polynomial.get_coefficients(names) for rule in self.rules])
+        weights = np.column_stack([
+            np.broadcast_to(evaluate_antecedants(flat_inputs), (size,)) for evaluate_antecedants in self._rule_antecedants
+        ])
+
+        weighted_sum = np.einsum("nr,nr->n", weights, x @ coefficients)
+        weights_sum = np.sum(weights, axis=1)
+        aggregate = np.divide(weighted_sum, weights_sum, out=np.zeros_like(weighted_sum), where=weights_sum != 0)
+        return aggregate.reshape(shape)
@@ -5,20 +5,180 @@
 
 
 from __future__ import annotations
-from typing import Generator, List, Optional
+from collections.abc import MutableSequence
+from typing import Generator, Iterable, Iterator, List, Optional
 
 
 class Requirement:
+
     def __init__(self, description: str, symbol: str, name: Optional[str] = None):
         self.name = name
         self.description = description
         self.symbol = symbol
+        # The revision is increased whenever the subtree changes, so that solvers can keep results of unchanged subtrees
+        self.parents = []
+        self.revision = 0
+        # Index of the subtree, built on first use and dropped whenever the subtree changes
+        self._index = None
+
+    def touch(self):
+        # Marks the requirement and all of its ancestors as changed
+        stack = [self]
+        changed = set()
+        while stack:
+            requirement = stack.pop()
+            if id(requirement) not in changed:
+                changed.add(id(requirement))
+                requirement.revision += 1
+                requirement._index = None
+                stack.extend(requirement.parents)
+
+    def iterate(self, requirement_type: type = None) -> Iterator[Requirement]:
+        # Preorder that visits shared subtrees at every reference, from the index only if there are none
+        index = self._get_index()
+        if index.shared:
+            return iterate_preorder(self, requirement_type)
+        return index.iterate(requirement_type)
+
+    def iterate_unique(self, requirement_type: type = None) -> Iterator[Requirement]:
+        # Preorder that visits every requirement once, always served from the index
+        return self._get_index().iterate(requirement_type)
+
+    def build_index(self) -> RequirementIndex:
+        self._index = RequirementIndex(self)
+        return self._index
+
+    def get_by_symbol(self, symbol: str) -> Optional[Requirement]:
+        return self._get_index().get_by_symbol(symbol)
+
+    def get_by_name(self, name: str) -> List[Requirement]:
+        return self._get_index().get_by_name(name)
+
+    def _get_index(self):
+        index = getattr(self, "_index", None)
+        return index if index is not None else self.build_index()
+
+
+def iterate_preorder(requirement: Requirement, requirement_type: type = None) -> Generator[Requirement]:
+    # Preorder with an explicit stack instead of nested generators
+    stack = [requirement]
+    while stack:
+        requirement = stack.pop()
+        if requirement_type == None or isinstance(requirement, requirement_type):
+            yield requirement
+        if isinstance(requirement, RefinedRequirement):
+            stack.extend(reversed(requirement.refinement))
+
+
+class RequirementIndex:
+    # Nodes of a subtree in preorder by type, symbol and name, shared subtrees only at their first reference
+    def __init__(self, requirement: Requirement):
+        self.nodes = []
+        self.shared = False
+        visited = set()
+        stack = [requirement]
+        while stack:
+            node = stack.pop()
+            if id(node) in visited:
+                self.shared = True
+                continue
+            visited.add(id(node))
+            self.nodes.append(node)
+            if isinstance(node, RefinedRequirement):
+                stack.extend(reversed(node.refinement))
+
+        self.types = {}
+        self.symbols = {}
+        self.names = {}
+        for node in self.nodes:
+            for requirement_type in type(node).__mro__:
+                self.types.setdefault(requirement_type, []).append(node)
+            if node.symbol not in self.symbols:
+                self.symbols[node.symbol] = node
+                if node.name is not None:
+                    self.names.setdefault(node.name, []).append(node)
+
+    def iterate(self, requirement_type: type = None) -> Iterator[Requirement]:
+        if requirement_type is None:
+            return iter(self.nodes)
+        if isinstance(requirement_type, type):
+            return iter(self.types.get(requirement_type, []))
+        return (node for node in self.nodes if isinstance(node, requirement_type))
+
+    def get_by_symbol(self, symbol: str) -> Optional[Requirement]:
+        return self.symbols.get(symbol)
+
+    def get_by_name(self, name: str) -> List[Requirement]:
+        return self.names.get(name, [])
+
+
+class Refinement(MutableSequence):
+    # Children of a refined requirement that keep their parents up to date and touch the requirement on every change
+    def __init__(self, owner: RefinedRequirement, children: Iterable[Requirement] = ()):
+        self.owner = owner
+        self._children = list(children)
+        for child in self._children:
+            child.parents.append(owner)
 
-    def iterate(self, requirement_type: type = None) -> Generator[Requirement]:
-        if requirement_type == None or isinstance(self, requirement_type):
-            yield self
+    def __getitem__(self, index):
+        return self._children[index]
+
+    def __len__(self):
+        return len(self._children)
+
+    def __iter__(self):
+        return iter(self._children)
+
+    def __reversed__(self):
+        return reversed(self._children)
+
+    def __eq__(self, other):
+        return list(self) == list(other) if isinstance(other, (Refinement, list)) else NotImplemented
+
+    def __repr__(self):
+        return repr(self._children)
+
+    def __setitem__(self, index, children):
+        if isinstance(index, slice):
+            removed, children = self._children[index], list(children)
+            added = children
         else:
-            return iter([])
+            removed, added = [self._children[index]], [children]
+        self._children[index] = children
+        self._changed(removed, added)
+
+    def __delitem__(self, index):
+        removed = self._children[index] if isinstance(index, slice) else [self._children[index]]
+        del self._children[index]
+        self._changed(removed, [])
+
+    def insert(self, index, child):
+        self._children.insert(index, child)
+        self._changed([], [child])
+
+    def extend(self, children):
+        children = list(children)
+        self._children.extend(children)
+        self._changed([], children)
+
+    def clear(self):
+        removed, self._children = self._children, []
+        self._changed(removed, [])
+
+    def reverse(self):
+        self._children.reverse()
+        self.owner.touch()
+
+    def sort(self, *args, **kwargs):
+        self._children.sort(*args, **kwargs)
+        self.owner.touch()
+
+    def _changed(self, removed: Iterable[Requirement], added: Iterable[Requirement]):
+        for child in removed:
+            child.parents.remove(self.owner)
+        for child in added:
+            child.parents.append(self.owner)
+        self.owner.touch()
 
 
 class RefinedRequirement(Requirement):
@@ -33,14 +193,33 @@ class RefinedRequirement(Requirement):
 
         self.refinement = refinement
         self.refinement_kind = refinement_type
-    
-    def iterate(self, requirement_type: type = None) -> Generator[Requirement]:
-        yield from super().iterate(requirement_type)
-        for child in self.refinement:
-            yield from child.iterate(requirement_type)
+
+    @property
+    def refinement(self) -> Refinement:
+        return self._refinement
+
+    @refinement.setter
+    def refinement(self, refinement: Iterable[Requirement]):
+        if hasattr(self, "_refinement"):
+            for child in self._refinement:
+                child.parents.remove(self)
+        self._refinement = Refinement(self, refinement)
+        self.touch()
+
+    @property
+    def refinement_kind(self) -> Optional[str]:
+        return self._refinement_kind
+
+    @refinement_kind.setter
+    def refinement_kind(self, refinement_kind: Optional[str]):
+        changed = getattr(self, "_refinement_kind", None) != refinement_kind
+        self._refinement_kind = refinement_kind
+        if changed:
+            self.touch()
 
 
 class LeafRequirement(Requirement):
+
     def __init__(self, description, symbol, name=None):
         super().__init__(description, symbol, name)
 
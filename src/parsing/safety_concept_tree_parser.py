@@ -4,6 +4,7 @@
 # Contact: andreas.kreutz@iks.fraunhofer.de
 
 
+from src.model.compact_safety_concept_tree import CompactSafetyConceptTree
 from src.model.safety_concept_tree import RefinedRequirement, UndevelopedRequirement, ContextAssumption, TechnicalRequirement, EmptyRequirement, ParameterContext
 
 
@@ -38,8 +39,22 @@ def strip_line(line):
     return requirement_type, name, decomposition, line
 
 
-def parse_indented_text(lines, sub_trees):
-    root = RefinedRequirement("")
+REQUIREMENT_TYPES = {
+    "refined": RefinedRequirement,
+    "context": ContextAssumption,
+    "component": TechnicalRequirement,
+    "empty": EmptyRequirement,
+    "parameter": ParameterContext,
+    "undeveloped": UndevelopedRequirement
+}
+
+
+def parse_indented_text(lines, sub_trees, tree=None):
+    # Builds requirement objects, or nodes of tree if a CompactSafetyConceptTree is given
+    if tree is None:
+        root = RefinedRequirement("")
+    else:
+        root = tree.add_requirement(RefinedRequirement, "")
     stack = [(root, -1)]  # Stack to maintain (node, indent_level) tuples
     
     for i in range(len(lines)):
@@ -49,42 +64,51 @@ def parse_indented_text(lines, sub_trees):
         requirement_type, name, decomposition, stripped_line = strip_line(line)
         if requirement_type == "reference":
             node = sub_trees[stripped_line]
+        elif tree is not None:
+            node = tree.add_requirement(REQUIREMENT_TYPES[requirement_type], stripped_line, None if requirement_type == "refined" else name)
         elif requirement_type == "refined":
             node = RefinedRequirement(stripped_line)
-        elif requirement_type == "context":
-            node = ContextAssumption(stripped_line, name)
-        elif requirement_type == "component":
-            node = TechnicalRequirement(stripped_line, name)
-        elif requirement_type == "empty":
-            node = EmptyRequirement(stripped_line, name)
-        elif requirement_type == "parameter":
-            node = ParameterContext(stripped_line, name)
         else:
-            node = UndevelopedRequirement(stripped_line, name)
+            node = REQUIREMENT_TYPES[requirement_type](stripped_line, name)
 
         while stack and stack[-1][1] >= current_indent:
             stack.pop()  # Pop the stack until we find the parent node
         
-        if isinstance(stack[-1][0], RefinedRequirement):
-            stack[-1][0].refinement.append(node)            # Add current node as a child to the last node in the stack
-            stack[-1][0].refinement_kind = decomposition    # Set decomposition of parent node
-        elif isinstance(stack[-1][0], TechnicalRequirement):
-            stack[-1][0].parameter_context = node
+        parent = stack[-1][0]
+        parent_type = type(parent) if tree is None else tree.get_type(parent)
+        if issubclass(parent_type, RefinedRequirement):
+            if tree is None:
+                parent.refinement.append(node)              # Add current node as a child to the last node in the stack
+                parent.refinement_kind = decomposition      # Set decomposition of parent node
+            else:
+                tree.add_child(parent, node)
+                tree.set_refinement_kind(parent, decomposition)
+        elif issubclass(parent_type, TechnicalRequirement):
+            if tree is None:
+                parent.parameter_context = node
+            else:
+                tree.set_parameter_context(parent, node)
 
         stack.append((node, current_indent))            # Push current node and its indent level to the stack
     
-    return root.refinement[0]  # Return children of the dummy root node
+    if tree is None:
+        return root.refinement[0]  # Return children of the dummy root node
+    return tree.get_children(root)[0]
 
 
-def parse_safety_concept_tree(file):
+def parse_safety_concept_tree(file, compact=False):
+    # With compact, the root is returned as a view of a CompactSafetyConceptTree
     with open(file) as f:
         data = f.read()
 
+    tree = CompactSafetyConceptTree() if compact else None
     sub_trees = {}
     for d in data.split("\n\n")[::-1]:
         lines = d.split("\n")
         lines = list(filter(lambda l: not l.startswith("#"), lines))
-        sub_tree = parse_indented_text(lines[1:], sub_trees)
+        sub_tree = parse_indented_text(lines[1:], sub_trees, tree)
         sub_trees[lines[0][:-1]] = sub_tree
 
-    return sub_trees["main"]
+    root = tree.freeze(sub_trees["main"]).get_root() if compact else sub_trees["main"]
+    root.build_index()
+    return root
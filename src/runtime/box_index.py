@@ -0,0 +1,227 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.model.fuzzy_inference.fuzzy_logic import flatten_inputs
+from src.model.fuzzy_inference.safe_region import extract_safe_region, is_above
+from src.utils.npz import load_npz
+
+
+NODE_CAPACITY = 16
+
+
+class BoxIndex:
+    def __init__(self, names: List[str], lower: np.ndarray, upper: np.ndarray, statistics: Optional[Dict[str, float]] = None):
+        # Union of axis-aligned boxes [lower, upper] in which a fuzzy constraint holds, indexed by a packed R-tree
+        self.names = list(names)
+        self.lower = np.asarray(lower, dtype=float).reshape(-1, len(self.names))
+        self.upper = np.asarray(upper, dtype=float).reshape(-1, len(self.names))
+        self.statistics = statistics if statistics is not None else {}
+        self._levels = build_rtree(self.lower, self.upper)
+
+    def contains(self, inputs: Dict[str, float]):
+        point = [inputs[name] for name in self.names]
+        if not self._levels:
+            return False
+        # Depth-first descent from the root, only into nodes whose bounding box contains the point
+        stack = [(len(self._levels) - 1, 0)]
+        while stack:
+            level, node = stack.pop()
+            lower, upper, first_child, n_children = self._levels[level]
+            if all(l <= p <= u for l, p, u in zip(lower[node], point, upper[node])):
+                if level == 0:
+                    return True
+                stack.extend((level - 1, child) for child in range(first_child[node], first_child[node] + n_children[node]))
+        return False
+
+    def contains_batch(self, inputs: Dict[str, np.ndarray]):
+        flat_inputs, shape = flatten_inputs(inputs, self.names)
+        points = np.stack([flat_inputs[name] for name in self.names], axis=1)
+        contained = np.zeros(points.shape[0], dtype=bool)
+        if not self._levels:
+            return contained.reshape(shape)
+
+        # All (point, node) pairs whose box contains the point, expanded one level at a time
+        point_ids = np.arange(points.shape[0])
+        node_ids = np.zeros(points.shape[0], dtype=np.int64)
+        for level in range(len(self._levels) - 1, -1, -1):
+            lower, upper, first_child, n_children = self._levels[level]
+            inside = np.all((lower[node_ids] <= points[point_ids]) & (points[point_ids] <= upper[node_ids]), axis=1)
+            point_ids = point_ids[inside]
+            node_ids = node_ids[inside]
+            if level == 0:
+                contained[point_ids] = True
+            else:
+                counts = n_children[node_ids]
+                starts = np.repeat(first_child[node_ids] - np.cumsum(counts) + counts, counts)
+                node_ids = starts + np.arange(np.sum(counts))
+                point_ids = np.repeat(point_ids, counts)
+        return contained.reshape(shape)
+
+    def get_volume(self):
+        return float(np.sum(np.prod(self.upper - self.lower, axis=1)))
+
+    def save(self, path):
+        np.savez(
+            path, names=np.array(self.names), lower=self.lower, upper=self.upper,
+            statistic_names=np.array(list(self.statistics.keys())), statistic_values=np.array(list(self.statistics.values()), dtype=float)
+        )
+
+
+def build_rtree(lower: np.ndarray, upper: np.ndarray):
+    # Packs the boxes bottom-up into a sort-tile-recursive R-tree, level 0 holds the boxes themselves
+    if lower.shape[0] == 0:
+        return []
+    order = sort_tile_recursive((lower + upper) / 2, np.arange(lower.shape[0]), 0)
+    lower, upper = lower[order], upper[order]
+    levels = [(lower, upper, np.zeros(lower.shape[0], dtype=np.int64), np.zeros(lower.shape[0], dtype=np.int64))]
+    while lower.shape[0] > 1:
+        first_child = np.arange(0, lower.shape[0], NODE_CAPACITY)
+        n_children = np.minimum(NODE_CAPACITY, lower.shape[0] - first_child)
+        lower = np.minimum.reduceat(lower, first_child, axis=0)
+        upper = np.maximum.reduceat(upper, first_child, axis=0)
+        levels.append((lower, upper, first_child, n_children))
+    return levels
+
+
+def sort_tile_recursive(centers: np.ndarray, ids: np.ndarray, dimension: int):
+    # Sorts the boxes into slabs along one dimension and each slab recursively along the next
+    ids = ids[np.argsort(centers[ids, dimension], kind="stable")]
+    if dimension == centers.shape[1] - 1:
+        return ids
+    n_leaves = int(np.ceil(ids.size / NODE_CAPACITY))
+    n_slabs = int(np.ceil(n_leaves ** (1 / (centers.shape[1] - dimension))))
+    slab_size = int(np.ceil(n_leaves / n_slabs)) * NODE_CAPACITY
+    return np.concatenate([
+        sort_tile_recursive(centers, ids[start:start + slab_size], dimension + 1) for start in range(0, ids.size, slab_size)
+    ])
+
+
+def merge_boxes(lower: np.ndarray, upper: np.ndarray):
+    # Merges boxes that touch along one dimension and have the same extent in all others, until nothing changes
+    changed = True
+    while changed and lower.shape[0] > 1:
+        changed = False
+        for dimension in range(lower.shape[1]):
+            others = [d for d in range(lower.shape[1]) if d != dimension]
+            order = np.lexsort([lower[:, dimension]] + [upper[:, d] for d in others] + [lower[:, d] for d in others])
+            lower, upper = lower[order], upper[order]
+
+            merged_lower, merged_upper = [lower[0].copy()], [upper[0].copy()]
+            for l, u in zip(lower[1:], upper[1:]):
+                previous_lower, previous_upper = merged_lower[-1], merged_upper[-1]
+                if (previous_upper[dimension] == l[dimension] and np.array_equal(previous_lower[others], l[others])
+                        and np.array_equal(previous_upper[others], u[others])):
+                    previous_upper[dimension] = u[dimension]
+                    changed = True
+                else:
+                    merged_lower.append(l.copy())
+                    merged_upper.append(u.copy())
+            lower, upper = np.array(merged_lower), np.array(merged_upper)
+    return lower, upper
+
+
+def verify_safe_cells(fis, threshold: float, safe_region, fixed_inputs: Optional[Dict[str, float]] = None):
+    # Replaces safe cells with an unsafe grid point inside by their unit cells whose corners are all safe
+    if fixed_inputs is None:
+        fixed_inputs = {}
+    corners, sizes = safe_region.safe_cells
+    dimensions = len(safe_region.names)
+    shape = (safe_region.n_cells + 1,) * dimensions
+    known = dict(zip(np.ravel_multi_index(safe_region.vertices.T, shape).tolist(), safe_region.vertices_safe.tolist()))
+    n_evaluations = 0
+
+    def get_safe(points):
+        nonlocal n_evaluations
+        keys = np.ravel_multi_index(points.reshape(-1, dimensions).T, shape)
+        new_keys = np.array([key for key in np.unique(keys).tolist() if key not in known], dtype=np.int64)
+        if new_keys.size > 0:
+            inputs = safe_region.to_inputs(np.stack(np.unravel_index(new_keys, shape), axis=1))
+            safe = is_above(fis, {**{name: inputs[:, i] for i, name in enumerate(safe_region.names)}, **fixed_inputs}, threshold)
+            known.update(zip(new_keys.tolist(), np.broadcast_to(safe, new_keys.shape).tolist()))
+            n_evaluations += new_keys.size
+        return np.array([known[key] for key in keys.tolist()], dtype=bool).reshape(points.shape[:-1])
+
+    offsets = np.array(list(product([0, 1], repeat=dimensions)), dtype=np.int64)
+    verified_corners, verified_sizes = [corners[sizes == 1]], [sizes[sizes == 1]]
+    for size in np.unique(sizes[sizes > 1]).tolist():
+        cells = corners[sizes == size]
+        points = np.array(list(product(range(size + 1), repeat=dimensions)), dtype=np.int64)
+        all_safe = np.all(get_safe(cells[:, np.newaxis, :] + points[np.newaxis, :, :]), axis=1)
+        verified_corners.append(cells[all_safe])
+        verified_sizes.append(np.full(np.sum(all_safe), size, dtype=np.int64))
+
+        unit_offsets = np.array(list(product(range(size), repeat=dimensions)), dtype=np.int64)
+        unit_cells = (cells[~all_safe][:, np.newaxis, :] + unit_offsets[np.newaxis, :, :]).reshape(-1, dimensions)
+        unit_safe = np.all(get_safe(unit_cells[:, np.newaxis, :] + offsets[np.newaxis, :, :]), axis=1)
+        verified_corners.append(unit_cells[unit_safe])
+        verified_sizes.append(np.ones(np.sum(unit_safe), dtype=np.int64))
+    return (np.concatenate(verified_corners).reshape(-1, dimensions), np.concatenate(verified_sizes)), n_evaluations
+
+
+def shrink_boxes(lower: np.ndarray, upper: np.ndarray, n_cells: int):
+    # Moves every face of a box in grid units that borders a grid cell outside all boxes one grid step inwards
+    dimensions = lower.shape[1]
+    covered = np.zeros((n_cells,) * dimensions, dtype=bool)
+    for l, u in zip(lower.tolist(), upper.tolist()):
+        covered[tuple(slice(a, b) for a, b in zip(l, u))] = True
+
+    shrunk_lower, shrunk_upper = lower.copy(), upper.copy()
+    for i, (l, u) in enumerate(zip(lower.tolist(), upper.tolist())):
+        for dimension in range(dimensions):
+            face = [slice(a, b) for a, b in zip(l, u)]
+            face[dimension] = slice(l[dimension] - 1, l[dimension])
+            if l[dimension] > 0 and not np.all(covered[tuple(face)]):
+                shrunk_lower[i, dimension] += 1
+            face[dimension] = slice(u[dimension], u[dimension] + 1)
+            if u[dimension] < n_cells and not np.all(covered[tuple(face)]):
+                shrunk_upper[i, dimension] -= 1
+    kept = np.all(shrunk_lower < shrunk_upper, axis=1)
+    return shrunk_lower[kept], shrunk_upper[kept]
+
+
+def compile_box_index(fis, threshold: float, resolution: Dict[str, float], bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+                      fixed_inputs: Optional[Dict[str, float]] = None, initial_cells: int = 4, n_volume_samples: int = 100000, seed: int = 0):
+    # Compiles the region with output >= threshold into boxes, which are only conservative at grid resolution
+    safe_region = extract_safe_region(fis, threshold, resolution, bounds, fixed_inputs, initial_cells)
+    (corners, sizes), n_verifications = verify_safe_cells(fis, threshold, safe_region, fixed_inputs)
+    lower, upper = merge_boxes(*shrink_boxes(corners, corners + sizes[:, np.newaxis], safe_region.n_cells))
+    box_index = BoxIndex(safe_region.names, safe_region.to_inputs(lower), safe_region.to_inputs(upper))
+
+    rng = np.random.default_rng(seed)
+    inputs = {
+        name: rng.uniform(l, u, n_volume_samples) for name, l, u in zip(safe_region.names, safe_region.lower, safe_region.upper)
+    }
+    in_boxes = box_index.contains_batch(inputs)
+    if fixed_inputs is not None:
+        inputs.update(fixed_inputs)
+    safe = np.broadcast_to(is_above(fis, inputs, threshold), in_boxes.shape)
+    if np.any(in_boxes & ~safe):
+        raise RuntimeError(
+            f"{np.sum(in_boxes & ~safe)} of {n_volume_samples} sampled inputs lie in a box but are not safe, compile with a finer resolution"
+        )
+
+    total_volume = float(np.prod(safe_region.upper - safe_region.lower))
+    box_volume = box_index.get_volume()
+    safe_volume = float(np.mean(safe)) * total_volume
+    box_index.statistics = {
+        "n_boxes": float(lower.shape[0]),
+        "n_evaluations": float(safe_region.n_evaluations + n_verifications),
+        "box_volume": box_volume,
+        "safe_volume": safe_volume,
+        "volume_lost": 1.0 - box_volume / safe_volume if safe_volume > 0 else 0.0
+    }
+    return box_index
+
+
+def load_box_index(path, mmap=True):
+    data = load_npz(path, mmap=mmap)
+    statistics = {str(name): float(value) for name, value in zip(data["statistic_names"], data["statistic_values"])}
+    return BoxIndex([str(name) for name in data["names"]], data["lower"], data["upper"], statistics)
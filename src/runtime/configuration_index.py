@@ -0,0 +1,89 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+from typing import Dict, Iterable
+
+import numpy as np
+
+
+REQUIREMENT_KINDS = ["context_assumptions", "technical_requirements", "undeveloped_requirements"]
+
+
+class ConfigurationIndex:
+    def __init__(self, configurations: Dict[int, Dict[str, list]]):
+        # Configurations as bitmasks over their requirements, enabled if contained in the availability mask
+        self.configuration_names = list(configurations.keys())
+        self.symbols = []
+        self._bits = {}
+        self._names = {}
+        for configuration in configurations.values():
+            for kind in REQUIREMENT_KINDS:
+                for requirement in configuration[kind]:
+                    if requirement.symbol not in self._bits:
+                        self._bits[requirement.symbol] = len(self.symbols)
+                        self.symbols.append(requirement.symbol)
+                    if requirement.name is not None:
+                        self._names[requirement.name] = requirement.symbol
+
+        # Configurations grouped by their context assumptions
+        self.groups = {}
+        self._group_ids = []
+        self._requirement_masks = []
+        for key, configuration in configurations.items():
+            context_mask = self.get_mask(requirement.symbol for requirement in configuration["context_assumptions"])
+            requirement_mask = self.get_mask(
+                requirement.symbol for kind in REQUIREMENT_KINDS[1:] for requirement in configuration[kind]
+            )
+            self.groups.setdefault(context_mask, []).append((requirement_mask, key))
+            self._group_ids.append(list(self.groups.keys()).index(context_mask))
+            self._requirement_masks.append(requirement_mask)
+
+        self._context_words = self.to_words(list(self.groups.keys()))
+        self._requirement_words = self.to_words(self._requirement_masks)
+        self._group_ids = np.array(self._group_ids, dtype=np.int64)
+
+    def get_n_words(self):
+        return max(1, (len(self.symbols) + 63) // 64)
+
+    def get_mask(self, requirements: Iterable[str]):
+        # Mask of the given symbols or names, requirements that no configuration uses are ignored
+        mask = 0
+        for requirement in requirements:
+            symbol = self._names.get(requirement, requirement)
+            if symbol in self._bits:
+                mask |= 1 << self._bits[symbol]
+        return mask
+
+    def query(self, available: int):
+        # Configurations enabled by the availability mask, in the order of the solver
+        enabled = set()
+        for context_mask, configurations in self.groups.items():
+            if context_mask & ~available == 0:
+                enabled.update(key for requirement_mask, key in configurations if requirement_mask & ~available == 0)
+        return [key for key in self.configuration_names if key in enabled]
+
+    def query_batch(self, available: np.ndarray):
+        # Whether each configuration is enabled in each of the availability masks in available
+        available = np.asarray(available, dtype=np.uint64)
+        if available.ndim == 1:
+            available = available[:, np.newaxis]
+        missing = ~available[:, np.newaxis, :]
+        context_holds = np.all(self._context_words[np.newaxis] & missing == 0, axis=-1)
+        requirements_available = np.all(self._requirement_words[np.newaxis] & missing == 0, axis=-1)
+        return context_holds[:, self._group_ids] & requirements_available
+
+    def pack(self, available: np.ndarray):
+        # Availability masks as uint64 words from booleans with one column per symbol in the order of self.symbols
+        available = np.asarray(available, dtype=bool).reshape(-1, len(self.symbols))
+        padded = np.zeros((available.shape[0], self.get_n_words() * 64), dtype=bool)
+        padded[:, :len(self.symbols)] = available
+        return np.packbits(padded, axis=1, bitorder="little").view("<u8").astype(np.uint64)
+
+    def to_words(self, masks):
+        n_words = self.get_n_words()
+        return np.array(
+            [[(mask >> (64 * i)) & 0xFFFFFFFFFFFFFFFF for i in range(n_words)] for mask in masks], dtype=np.uint64
+        ).reshape(-1, n_words)
@@ -0,0 +1,71 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.runtime.configurations_evaluator import ConfigurationsEvaluator
+
+
+class ConfigurationScheduler:
+    def __init__(self, evaluator: ConfigurationsEvaluator, preference: Optional[List] = None, smoothing: float = 0.2):
+        # Finds the first safe configuration in order of preference, by default in the order of the solver
+        self.evaluator = evaluator
+        self.preference = preference if preference is not None else evaluator.get_configuration_names()
+        self.smoothing = smoothing
+
+        keys = evaluator.get_configuration_names()
+        unknown = [key for key in self.preference if key not in keys]
+        if unknown:
+            raise RuntimeError("Unknown configurations " + ", ".join(str(key) for key in unknown))
+        self._combinations = {key: evaluator.combinations[evaluator.configuration_combinations[keys.index(key)]] for key in keys}
+
+        # Exponential moving average of the measured run time of each context FIS
+        self.costs = {name: None for name in evaluator.context_names}
+        self.n_evaluations = {name: 0 for name in evaluator.context_names}
+
+    def get_first_safe(self, inputs: Dict[str, float]):
+        # Returns the most preferred safe configuration or None, computing each context FIS at most once
+        aggregates = {}
+        decisions = {}
+        for key in self.preference:
+            combination = self._combinations[key]
+            if combination not in decisions:
+                decisions[combination] = self._is_safe(combination, inputs, aggregates)
+            if decisions[combination]:
+                return key
+        return None
+
+    def _is_safe(self, combination, inputs, aggregates):
+        # Computes the cheapest context assumptions first, an empty aggregate makes the whole combination empty
+        combined = None
+        for name in sorted(combination, key=self._get_cost):
+            if name not in aggregates:
+                aggregates[name] = self._compute(name, inputs)
+            combined = aggregates[name] if combined is None else np.fmin(combined, aggregates[name])
+            if not np.any(combined) and self.evaluator.threshold > 0:
+                return False
+        # The evaluator decides, so both agree also on configurations without context assumptions
+        return bool(self.evaluator.is_safe([combined[np.newaxis]] if combined is not None else [], (1,))[0])
+
+    def _compute(self, name, inputs):
+        fis = self.evaluator.context_fis[name]
+        start = time.perf_counter()
+        aggregate = fis.compute({k: inputs[k] for k in fis.antecedants}, defuzz=False)
+        cost = time.perf_counter() - start
+
+        self.n_evaluations[name] += 1
+        if self.costs[name] is None:
+            self.costs[name] = cost
+        else:
+            self.costs[name] += self.smoothing * (cost - self.costs[name])
+        return aggregate
+
+    def _get_cost(self, name):
+        # Context FIS that were never timed are computed first, so that their cost is known
+        return self.costs[name] if self.costs[name] is not None else 0.0
@@ -0,0 +1,100 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+from typing import Dict
+
+import numpy as np
+
+from src.model.fuzzy_inference.fuzzy_logic import flatten_inputs
+from src.model.fuzzy_inference.mamdani import MamdaniFIS
+
+
+class ConfigurationsEvaluator:
+    def __init__(self, configurations: Dict[int, Dict[str, list]], context_fis: Dict[str, MamdaniFIS], threshold: float):
+        # Configurations as returned by ConfigurationsSolver.get_configurations with a FIS per context assumption
+        self.configurations = configurations
+        self.context_fis = context_fis
+        self.threshold = threshold
+
+        # Every context FIS and every distinct combination of context assumptions is evaluated once
+        self.context_names = []
+        self.combinations = []
+        self.configuration_combinations = []
+        for configuration in configurations.values():
+            combination = []
+            for context_assumption in configuration["context_assumptions"]:
+                if context_assumption.name not in context_fis:
+                    raise RuntimeError("No FIS given for context assumption " + str(context_assumption.name))
+                if context_assumption.name not in combination:
+                    combination.append(context_assumption.name)
+                if context_assumption.name not in self.context_names:
+                    self.context_names.append(context_assumption.name)
+            combination = tuple(sorted(combination, key=self.context_names.index))
+            if combination not in self.combinations:
+                self.combinations.append(combination)
+            self.configuration_combinations.append(self.combinations.index(combination))
+
+        self.consequent = None
+        for name in self.context_names:
+            consequent = context_fis[name].consequent
+            if self.consequent is None:
+                self.consequent = consequent
+            elif not np.array_equal(consequent.universe, self.consequent.universe):
+                raise RuntimeError("Context FIS " + name + " has a different output universe, its outputs can not be combined")
+
+    def get_configuration_names(self):
+        return list(self.configurations.keys())
+
+    def evaluate(self, inputs: Dict[str, np.ndarray]):
+        # Returns whether each configuration is safe for each input, with the configurations along the last axis
+        flat_inputs, shape = flatten_inputs(inputs)
+
+        aggregates = {}
+        for name in self.context_names:
+            fis = self.context_fis[name]
+            aggregates[name] = fis.compute_batch({k: flat_inputs[k] for k in fis.antecedants}, defuzz=False)
+
+        safe = np.stack([
+            self.is_safe([aggregates[name] for name in combination], (int(np.prod(shape)),)) for combination in self.combinations
+        ], axis=-1)
+        return safe[:, self.configuration_combinations].reshape(shape + (len(self.configurations),))
+
+    def evaluate_product(self, inputs: Dict[str, Dict[str, np.ndarray]]):
+        # Whether each configuration is safe for all combinations of the samples of the context assumptions
+        axes = list(inputs.keys())
+        missing = [name for name in self.context_names if name not in axes]
+        if missing:
+            raise RuntimeError("No inputs given for context assumptions " + ", ".join(missing))
+
+        sizes = []
+        aggregates = {}
+        for i, name in enumerate(axes):
+            flat_inputs, flat_shape = flatten_inputs(inputs[name])
+            sizes.append(int(np.prod(flat_shape)))
+            if name in self.context_names:
+                fis = self.context_fis[name]
+                aggregate = fis.compute_batch(flat_inputs, defuzz=False)
+                # Samples of this context assumption on their own axis
+                aggregates[name] = aggregate.reshape((1,) * i + (sizes[-1],) + (1,) * (len(axes) - i - 1) + aggregate.shape[-1:])
+
+        shape = tuple(sizes)
+        safe = []
+        for combination in self.combinations:
+            combination_aggregates = [aggregates[name] for name in combination]
+            combination_shape = np.broadcast_shapes(*[a.shape[:-1] for a in combination_aggregates]) if combination else (1,) * len(axes)
+            safe.append(np.broadcast_to(self.is_safe(combination_aggregates, combination_shape), shape))
+        safe = np.stack(safe, axis=-1)
+        return safe[..., self.configuration_combinations]
+
+    def is_safe(self, aggregates, shape):
+        # Configurations without context assumptions are safe, others if the minimum of their aggregates is
+        if not aggregates:
+            return np.ones(shape, dtype=bool)
+        combined = aggregates[0]
+        for aggregate in aggregates[1:]:
+            combined = np.fmin(combined, aggregate)
+        combined = np.broadcast_to(combined, shape + combined.shape[-1:])
+        return (self.consequent.defuzzify_batch(combined.reshape(-1, combined.shape[-1])) >= self.threshold).reshape(shape)
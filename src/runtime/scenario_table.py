@@ -0,0 +1,71 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+from typing import List, Sequence
+
+import numpy as np
+
+from src.utils.npz import load_npz
+
+
+# Number of set bits of every byte value
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+
+class ScenarioTable:
+    def __init__(self, input_names: List[str], axes: List[np.ndarray], configuration_names: List[str], bits: np.ndarray):
+        # Safe configurations for all scenarios of a grid, one bit per scenario in C order of the grid
+        self.input_names = list(input_names)
+        self.axes = [np.asarray(axis, dtype=float) for axis in axes]
+        self.configuration_names = list(configuration_names)
+        self.bits = bits
+        self.shape = tuple(axis.size for axis in self.axes)
+        self.n_scenarios = int(np.prod(self.shape))
+
+    def get_index(self, grid_index: Sequence[int]):
+        return int(np.ravel_multi_index(tuple(grid_index), self.shape))
+
+    def lookup(self, grid_index: Sequence[int]):
+        # Whether each configuration is safe in the scenario at grid_index
+        index = self.get_index(grid_index)
+        return (self.bits[:, index >> 3] >> (index & 7)) & 1 == 1
+
+    def get_configurations(self, grid_index: Sequence[int]):
+        return [name for name, safe in zip(self.configuration_names, self.lookup(grid_index)) if safe]
+
+    def get_inputs(self, grid_index: Sequence[int]):
+        return {name: float(axis[i]) for name, axis, i in zip(self.input_names, self.axes, grid_index)}
+
+    def count_safe(self, chunk_size: int = 1 << 20):
+        # Number of scenarios in which each configuration is safe, reading chunk_size bytes per configuration at a time
+        counts = np.zeros(len(self.configuration_names), dtype=np.int64)
+        for start in range(0, self.bits.shape[1], chunk_size):
+            counts += np.sum(POPCOUNT[self.bits[:, start:start + chunk_size]], axis=1)
+        return dict(zip(self.configuration_names, counts.tolist()))
+
+    def unpack(self):
+        return np.unpackbits(self.bits, axis=1, count=self.n_scenarios, bitorder="little").T.reshape(self.shape + (-1,)) == 1
+
+    def save(self, path):
+        np.savez(
+            path, input_names=np.array(self.input_names), axis_sizes=np.array(self.shape, dtype=np.int64),
+            axis_values=np.concatenate(self.axes) if self.axes else np.zeros(0), configuration_names=np.array(self.configuration_names),
+            bits=np.ascontiguousarray(self.bits)
+        )
+
+
+def pack_scenario_table(input_names: List[str], axes: List[np.ndarray], configuration_names: List[str], safe: np.ndarray):
+    # safe holds whether each configuration is safe, with one axis per input and the configurations along the last axis
+    safe = np.asarray(safe, dtype=bool).reshape(-1, len(configuration_names))
+    return ScenarioTable(input_names, axes, configuration_names, np.packbits(safe.T, axis=1, bitorder="little"))
+
+
+def load_scenario_table(path, mmap=True):
+    data = load_npz(path, mmap=mmap)
+    axes = np.split(np.asarray(data["axis_values"]), np.cumsum(data["axis_sizes"])[:-1])
+    return ScenarioTable(
+        [str(name) for name in data["input_names"]], axes, [str(name) for name in data["configuration_names"]], data["bits"]
+    )
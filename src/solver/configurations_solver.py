@@ -4,47 +4,176 @@
 # Contact: andreas.kreutz@iks.fraunhofer.de
 
 
+from typing import Dict, Iterable, Optional
+
 from src.model.safety_concept_tree import LeafRequirement, RefinedRequirement, ContextAssumption, UndevelopedRequirement, TechnicalRequirement
+from src.solver.zdd import ZDD
 
 
 class ConfigurationsSolver:
-    def __init__(self, safety_concept_tree):
+    BACKENDS = ["bitset", "zdd"]
+
+    def __init__(self, safety_concept_tree, backend: str = "bitset", memoize: bool = True):
+        # The bitset backend expands cut sets explicitly, the zdd backend keeps them in a decision diagram
+        if backend not in ConfigurationsSolver.BACKENDS:
+            raise RuntimeError("Unknown solver backend " + backend)
         self.safety_concept_tree = safety_concept_tree
+        self.backend = backend
+        # Cut sets of every node are kept between solves with its revision, only changed nodes are recomputed
+        self.memoize = memoize
+        self.n_recomputed = 0
+
+        self._leaves = []
+        self._bits = {}
+        self._caches = {backend: {} for backend in ConfigurationsSolver.BACKENDS}
+        self._reference_counts = {backend: {} for backend in ConfigurationsSolver.BACKENDS}
+        self._roots = {backend: None for backend in ConfigurationsSolver.BACKENDS}
+        self._zdd = ZDD()
 
     def get_configurations(self):
+        return {i: configuration for i, configuration in enumerate(self.iterate_configurations())}
+
+    def iterate_configurations(self):
+        # Yields the configurations one at a time, only the zdd backend streams them without expanding all
+        for cut_set in self._solve():
+            yield self._get_configuration(cut_set)
+
+    def count_configurations(self):
+        cut_sets = self._solve()
+        if self.backend == "zdd":
+            return self._zdd.count(self._root)
+        return len(cut_sets)
+
+    def top_k(self, k: int, costs: Optional[Dict[str, float]] = None, context: Optional[Iterable[str]] = None):
+        # Returns the k cheapest configurations as (cost, configuration), by default technical requirements cost 1
+        root = self._solve_zdd()
+        context = set(context) if context is not None else None
+
+        variable_costs = []
+        for requirement in self._leaves:
+            if context is not None and isinstance(requirement, ContextAssumption) and requirement.name not in context:
+                variable_costs.append(float("inf"))
+            elif costs is not None:
+                variable_costs.append(costs.get(requirement.name, 0.0))
+            else:
+                variable_costs.append(1.0 if isinstance(requirement, TechnicalRequirement) else 0.0)
+
+        return [(cost, self._get_configuration(cut_set)) for cost, cut_set in self._zdd.get_cheapest(root, variable_costs, k)]
+
+    def _solve(self):
+        if self.backend == "zdd":
+            return self._zdd.iterate(self._solve_zdd())
+        self._prepare("bitset")
         cut_sets = self._iterate(self.safety_concept_tree)
+        self._finish("bitset")
+        # Both backends give the cut sets in the lexicographic order of their sorted bits
+        return sorted(cut_sets, key=self._get_bits)
+
+    def _solve_zdd(self):
+        self._prepare("zdd")
+        self._root = self._iterate_zdd(self.safety_concept_tree)
+        self._finish("zdd")
+        return self._root
+
+    def _prepare(self, backend):
+        self.n_recomputed = 0
+        self._cut_sets = self._caches[backend]
+        self._references = self._reference_counts[backend]
+
+    def _finish(self, backend):
+        # The solver itself references the cut sets of the root
+        if self.memoize and self._roots[backend] is not self.safety_concept_tree:
+            self._add_reference(self.safety_concept_tree)
+            if self._roots[backend] is not None:
+                self._release(self._roots[backend])
+            self._roots[backend] = self.safety_concept_tree
+
+    def _store(self, requirement, cut_sets, cached):
+        # New children are referenced before the previous ones are released
+        children = list(requirement.refinement) if isinstance(requirement, RefinedRequirement) else []
+        for child in children:
+            self._add_reference(child)
+        self._cut_sets[id(requirement)] = (requirement, requirement.revision, cut_sets, children)
+        if cached is not None:
+            for child in cached[3]:
+                self._release(child)
+
+    def _add_reference(self, requirement):
+        self._references[id(requirement)] = self._references.get(id(requirement), 0) + 1
+
+    def _release(self, requirement):
+        # Drops the cut sets of nodes that are no longer referenced, and releases their children in turn
+        stack = [requirement]
+        while stack:
+            key = id(stack.pop())
+            self._references[key] -= 1
+            if self._references[key] == 0:
+                del self._references[key]
+                cached = self._cut_sets.pop(key, None)
+                if cached is not None:
+                    stack.extend(cached[3])
 
-        configurations = {}
-        for i, cut_set in enumerate(cut_sets):
-            context_assumptions = []
-            undeveloped_requirements = []
-            technical_requirements = []
-            for requirement in cut_set:
-                if isinstance(requirement, ContextAssumption):
-                    context_assumptions.append(requirement)
-                elif isinstance(requirement, UndevelopedRequirement):
-                    undeveloped_requirements.append(requirement)
-                elif isinstance(requirement, TechnicalRequirement):
-                    technical_requirements.append(requirement)
-            configurations[i] = {
-                "context_assumptions": context_assumptions,
-                "technical_requirements": technical_requirements,
-                "undeveloped_requirements": undeveloped_requirements
-            }
-        return configurations
+    def _get_bit(self, requirement):
+        # Leaves get the next free bit when they are first expanded
+        bit = self._bits.get(requirement.symbol)
+        if bit is None:
+            bit = len(self._leaves)
+            self._bits[requirement.symbol] = bit
+            self._leaves.append(requirement)
+        return bit
+
+    def _get_configuration(self, cut_set):
+        context_assumptions = []
+        undeveloped_requirements = []
+        technical_requirements = []
+        for requirement in self._get_requirements(cut_set):
+            if isinstance(requirement, ContextAssumption):
+                context_assumptions.append(requirement)
+            elif isinstance(requirement, UndevelopedRequirement):
+                undeveloped_requirements.append(requirement)
+            elif isinstance(requirement, TechnicalRequirement):
+                technical_requirements.append(requirement)
+        return {
+            "context_assumptions": context_assumptions,
+            "technical_requirements": technical_requirements,
+            "undeveloped_requirements": undeveloped_requirements
+        }
+
+    def _get_requirements(self, cut_set):
+        # Requirements are reported in the order of their bits
+        return [self._leaves[bit] for bit in self._get_bits(cut_set)]
+
+    def _get_bits(self, cut_set):
+        bits = []
+        while cut_set:
+            lowest_bit = cut_set & -cut_set
+            bits.append(lowest_bit.bit_length() - 1)
+            cut_set ^= lowest_bit
+        return bits
 
     def _iterate(self, requirement):
+        cached = self._cut_sets.get(id(requirement))
+        if cached is not None and cached[1] == requirement.revision:
+            return cached[2]
+        cut_sets = self._expand(requirement)
+        self.n_recomputed += 1
+        if self.memoize:
+            self._store(requirement, cut_sets, cached)
+        return cut_sets
+
+    def _expand(self, requirement):
         if issubclass(type(requirement), LeafRequirement):
-            return [[requirement]]
-        elif type(requirement) == RefinedRequirement:
+            return [1 << self._get_bit(requirement)]
+        elif isinstance(requirement, RefinedRequirement):
             if requirement.refinement_kind == "and":
-                cut_sets = [[]]
+                cut_sets = [0]
                 for child in requirement.refinement:
                     cut_sets = self._combine_and(cut_sets, self._iterate(child))
             elif requirement.refinement_kind == "or":
                 cut_sets = []
                 for child in requirement.refinement:
                     cut_sets += self._iterate(child)
+                cut_sets = self._minimize(cut_sets)
             elif requirement.refinement_kind == "not":
                 cut_sets = self._iterate(requirement.refinement[0])
             else:
@@ -53,11 +182,61 @@ class ConfigurationsSolver:
         else:
             raise RuntimeError("Unexpected requirement type " + str(type(requirement)))
     
+    def _iterate_zdd(self, requirement):
+        cached = self._cut_sets.get(id(requirement))
+        if cached is not None and cached[1] == requirement.revision:
+            return cached[2]
+        cut_sets = self._expand_zdd(requirement)
+        self.n_recomputed += 1
+        if self.memoize:
+            self._store(requirement, cut_sets, cached)
+        return cut_sets
+
+    def _expand_zdd(self, requirement):
+        if issubclass(type(requirement), LeafRequirement):
+            return self._zdd.single(self._get_bit(requirement))
+        elif isinstance(requirement, RefinedRequirement):
+            # Children are expanded in order and combined from the last to the first
+            if requirement.refinement_kind == "and":
+                cut_sets = ZDD.BASE
+                for child_cut_sets in reversed([self._iterate_zdd(child) for child in requirement.refinement]):
+                    cut_sets = self._zdd.product(child_cut_sets, cut_sets)
+            elif requirement.refinement_kind == "or":
+                cut_sets = ZDD.EMPTY
+                for child_cut_sets in reversed([self._iterate_zdd(child) for child in requirement.refinement]):
+                    cut_sets = self._zdd.union(child_cut_sets, cut_sets)
+            elif requirement.refinement_kind == "not":
+                return self._iterate_zdd(requirement.refinement[0])
+            else:
+                raise RuntimeError("Refinement kind is not initialized for requirement " + requirement.description)
+            return self._zdd.minimal(cut_sets)
+        else:
+            raise RuntimeError("Unexpected requirement type " + str(type(requirement)))
+
     def _combine_and(self, sets_left, sets_right):
-        combined_sets = []
-        for set_left in sets_left:
-            for set_right in sets_right:
-                combined_set = [v for v in set_left]
-                [combined_set.append(v) for v in set_right if v.symbol not in [c.symbol for c in combined_set]]
-                combined_sets.append(combined_set)
-        return combined_sets
+        return self._minimize([set_left | set_right for set_left in sets_left for set_right in sets_right])
+
+    def _minimize(self, cut_sets):
+        # Removes duplicates and supersets of other cut sets, the remaining cut sets keep their order
+        unique = set(cut_sets)
+        if 0 in unique:
+            return [0]
+        minimal = set()
+        by_lowest_bit = {}
+        for cut_set in sorted(unique, key=lambda cut_set: bin(cut_set).count("1")):
+            remaining = cut_set
+            subsumed = False
+            while remaining and not subsumed:
+                bit = remaining & -remaining
+                remaining ^= bit
+                subsumed = any(kept & cut_set == kept for kept in by_lowest_bit.get(bit, ()))
+            if not subsumed:
+                minimal.add(cut_set)
+                by_lowest_bit.setdefault(cut_set & -cut_set, []).append(cut_set)
+
+        ordered = []
+        for cut_set in cut_sets:
+            if cut_set in minimal:
+                ordered.append(cut_set)
+                minimal.remove(cut_set)
+        return ordered
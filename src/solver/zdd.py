@@ -0,0 +1,244 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+from __future__ import annotations
+import heapq
+from typing import Generator, List
+
+
+class ZDD:
+    # Zero-suppressed decision diagrams over the variables 0, 1, 2, ..., node 0 is the empty family and 1 the empty set
+    EMPTY = 0
+    BASE = 1
+
+    def __init__(self):
+        self._variables = [None, None]
+        self._lows = [None, None]
+        self._highs = [None, None]
+        self._unique = {}
+
+        self._union_cache = {}
+        self._product_cache = {}
+        self._nonsup_cache = {}
+        self._minimal_cache = {}
+        self._count_cache = {}
+
+    def get_node(self, variable: int, low: int, high: int):
+        # Zero-suppression, nodes with an empty high branch are not created
+        if high == ZDD.EMPTY:
+            return low
+        key = (variable, low, high)
+        node = self._unique.get(key)
+        if node is None:
+            node = len(self._variables)
+            self._variables.append(variable)
+            self._lows.append(low)
+            self._highs.append(high)
+            self._unique[key] = node
+        return node
+
+    def get_size(self):
+        return len(self._variables)
+
+    def single(self, variable: int):
+        # Family with the single set {variable}
+        return self.get_node(variable, ZDD.EMPTY, ZDD.BASE)
+
+    def union(self, f: int, g: int):
+        return self._run(self._union(f, g))
+
+    def product(self, f: int, g: int):
+        # Unions a | b of all sets a in f and b in g
+        return self._run(self._product(f, g))
+
+    def nonsup(self, f: int, g: int):
+        # Sets of f that are no superset of any set in g
+        return self._run(self._nonsup(f, g))
+
+    def minimal(self, f: int):
+        # Sets of f that are no strict superset of another set in f
+        return self._run(self._minimal(f))
+
+    def contains_empty(self, f: int):
+        while f > ZDD.BASE:
+            f = self._lows[f]
+        return f == ZDD.BASE
+
+    def count(self, f: int):
+        # Number of sets in f, without enumerating them
+        return self._run(self._count(f))
+
+    def iterate(self, f: int) -> Generator[int]:
+        # Yields the sets of f as bitmasks one at a time, in lexicographic order of their sorted variables
+        stack = [(f, 0)]
+        while stack:
+            node, mask = stack.pop()
+            if node == ZDD.BASE:
+                yield mask
+            elif node != ZDD.EMPTY:
+                stack.append((self._lows[node], mask))
+                stack.append((self._highs[node], mask | (1 << self._variables[node])))
+
+    def get_cheapest(self, f: int, costs: List[float], k: int):
+        # The k sets of f with the lowest sum of variable costs as (cost, bitmask), by depth-first branch and bound
+        if k <= 0:
+            return []
+        bounds = self._get_bounds(f, costs)
+
+        best = []  # Max-heap of (-cost, -order, mask) holding the k cheapest sets found so far
+        order = 0
+        stack = [(f, 0, 0.0)]
+        while stack:
+            node, mask, cost = stack.pop()
+            if cost + bounds[node] == float("inf"):
+                continue
+            if len(best) == k and cost + bounds[node] >= -best[0][0]:
+                continue
+            if node == ZDD.BASE:
+                heapq.heappush(best, (-cost, -order, mask))
+                order += 1
+                if len(best) > k:
+                    heapq.heappop(best)
+                continue
+            variable = self._variables[node]
+            stack.append((self._lows[node], mask, cost))
+            stack.append((self._highs[node], mask | (1 << variable), cost + costs[variable]))
+        return [(-cost, mask) for cost, _, mask in sorted(best, reverse=True)]
+
+    def _get_bounds(self, f: int, costs: List[float]):
+        # Cost of the cheapest set below every node reachable from f, children before their parents
+        bounds = {ZDD.EMPTY: float("inf"), ZDD.BASE: 0.0}
+        stack = [f]
+        while stack:
+            node = stack[-1]
+            if node in bounds:
+                stack.pop()
+                continue
+            low, high = self._lows[node], self._highs[node]
+            if low in bounds and high in bounds:
+                bounds[node] = min(bounds[low], costs[self._variables[node]] + bounds[high])
+                stack.pop()
+            else:
+                stack.extend(child for child in (low, high) if child not in bounds)
+        return bounds
+
+    def _run(self, operation):
+        # Runs operations that yield the operations they need on an explicit stack instead of the call stack
+        stack = [operation]
+        result = None
+        while stack:
+            try:
+                operation = stack[-1].send(result)
+            except StopIteration as stop:
+                stack.pop()
+                result = stop.value
+            else:
+                stack.append(operation)
+                result = None
+        return result
+
+    def _union(self, f: int, g: int):
+        if f == ZDD.EMPTY or f == g:
+            return g
+        if g == ZDD.EMPTY:
+            return f
+        if f > g:
+            f, g = g, f
+        key = (f, g)
+        result = self._union_cache.get(key)
+        if result is not None:
+            return result
+
+        f_variable, g_variable = self._get_variable(f), self._get_variable(g)
+        if f_variable < g_variable:
+            result = self.get_node(f_variable, (yield self._union(self._lows[f], g)), self._highs[f])
+        elif f_variable > g_variable:
+            result = self.get_node(g_variable, (yield self._union(f, self._lows[g])), self._highs[g])
+        else:
+            low = yield self._union(self._lows[f], self._lows[g])
+            result = self.get_node(f_variable, low, (yield self._union(self._highs[f], self._highs[g])))
+        self._union_cache[key] = result
+        return result
+
+    def _product(self, f: int, g: int):
+        if f == ZDD.EMPTY or g == ZDD.EMPTY:
+            return ZDD.EMPTY
+        if f == ZDD.BASE:
+            return g
+        if g == ZDD.BASE:
+            return f
+        if f > g:
+            f, g = g, f
+        key = (f, g)
+        result = self._product_cache.get(key)
+        if result is not None:
+            return result
+
+        f_variable, g_variable = self._variables[f], self._variables[g]
+        if f_variable > g_variable:
+            f, g = g, f
+            f_variable, g_variable = g_variable, f_variable
+        if f_variable < g_variable:
+            low = yield self._product(self._lows[f], g)
+            result = self.get_node(f_variable, low, (yield self._product(self._highs[f], g)))
+        else:
+            f_low, f_high, g_low, g_high = self._lows[f], self._highs[f], self._lows[g], self._highs[g]
+            high_high = yield self._product(f_high, g_high)
+            high_low = yield self._product(f_high, g_low)
+            low_high = yield self._product(f_low, g_high)
+            high = yield self._union(high_high, (yield self._union(high_low, low_high)))
+            result = self.get_node(f_variable, (yield self._product(f_low, g_low)), high)
+        self._product_cache[key] = result
+        return result
+
+    def _nonsup(self, f: int, g: int):
+        if g == ZDD.EMPTY:
+            return f
+        if f == ZDD.EMPTY or g == ZDD.BASE or f == g:
+            return ZDD.EMPTY
+        if f == ZDD.BASE:
+            return ZDD.EMPTY if self.contains_empty(g) else ZDD.BASE
+        key = (f, g)
+        result = self._nonsup_cache.get(key)
+        if result is not None:
+            return result
+
+        f_variable, g_variable = self._variables[f], self._variables[g]
+        if f_variable < g_variable:
+            low = yield self._nonsup(self._lows[f], g)
+            result = self.get_node(f_variable, low, (yield self._nonsup(self._highs[f], g)))
+        elif f_variable > g_variable:
+            # Sets of g with the variable of g can not be subsets of sets of f
+            result = yield self._nonsup(f, self._lows[g])
+        else:
+            high = yield self._nonsup((yield self._nonsup(self._highs[f], self._highs[g])), self._lows[g])
+            result = self.get_node(f_variable, (yield self._nonsup(self._lows[f], self._lows[g])), high)
+        self._nonsup_cache[key] = result
+        return result
+
+    def _minimal(self, f: int):
+        if f <= ZDD.BASE:
+            return f
+        result = self._minimal_cache.get(f)
+        if result is not None:
+            return result
+        low = yield self._minimal(self._lows[f])
+        result = self.get_node(self._variables[f], low, (yield self._nonsup((yield self._minimal(self._highs[f])), low)))
+        self._minimal_cache[f] = result
+        return result
+
+    def _count(self, f: int):
+        if f <= ZDD.BASE:
+            return f
+        result = self._count_cache.get(f)
+        if result is None:
+            result = (yield self._count(self._lows[f])) + (yield self._count(self._highs[f]))
+            self._count_cache[f] = result
+        return result
+
+    def _get_variable(self, f: int):
+        # Terminals come after all variables
+        return self._variables[f] if f > ZDD.BASE else float("inf")
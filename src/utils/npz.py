@@ -0,0 +1,44 @@
+# Copyright©[2025] Fraunhofer-Gesellschaft zur Foerderung der angewandten Forschung e.V. acting on behalf of its Fraunhofer-Institut für Kognitive Systeme IKS. All rights reserved.  
+# This software is subject to the terms and conditions of the GNU GPLv2 (https://www.gnu.de/documents/gpl-2.0.de.html).
+
+# Contact: andreas.kreutz@iks.fraunhofer.de
+
+
+import struct
+import zipfile
+from typing import Dict
+
+import numpy as np
+
+
+def load_npz(path, mmap: bool = False) -> Dict[str, np.ndarray]:
+    # Loads all arrays of an uncompressed .npz, with mmap memory-mapped in place instead of read
+    if not mmap:
+        with np.load(path, allow_pickle=False) as data:
+            return {key: data[key] for key in data.files}
+
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise RuntimeError(f"Cannot memory-map compressed member {info.filename} of {path}")
+            # The local file header has a fixed size of 30 bytes, followed by the file name and an extra field
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack("<HH", f.read(4))
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise RuntimeError(f"Cannot memory-map object array {info.filename} of {path}")
+
+            order = "F" if fortran_order else "C"
+            key = info.filename[:-len(".npy")]
+            if np.prod(shape) == 0:
+                arrays[key] = np.empty(shape, dtype=dtype, order=order)
+            else:
+                arrays[key] = np.memmap(path, dtype=dtype, mode="r", offset=f.tell(), shape=shape, order=order)
+    return arrays
@@ -17,7 +17,7 @@ def draw_csct(csct, scale=1, x_scale=0.86, y_scale=0.8, symbols=False):
     G = nx.Graph()
     drawn_edges = []
     
-    for requirement in csct.iterate():
+    for requirement in csct.iterate_unique():
         if isinstance(requirement, ContextAssumption):
             node_style = "context"
         elif isinstance(requirement, RefinedRequirement):
@@ -10,7 +10,7 @@ from settings import SUGENO_MEMBERSHIPS
 
 from src.model.fuzzy_inference.fuzzy_logic import Antecedant, Consequent
 from src.model.fuzzy_inference.sugeno import SugenoRule, SugenoFIS, Polynomial
-from src.model.fuzzy_inference.membership_functions import get_membership_functions, get_intervals, get_centroid
+from src.model.fuzzy_inference.membership_functions import get_parametric_membership_functions, get_intervals, get_centroid
 
 
 d = 7
@@ -54,13 +54,13 @@ def get_amr_velocity_fis(n_samples):
     load_weight_universe = np.linspace(0, 2000, n_samples, endpoint=True)
     load_weight_terms = ["Light", "Medium", "Heavy"]
     load_weight = Antecedant(
-        "LoadWeight", load_weight_terms, load_weight_universe, get_membership_functions(load_weight_universe, SUGENO_MEMBERSHIPS)
+        "LoadWeight", load_weight_terms, load_weight_universe, get_parametric_membership_functions(load_weight_universe, SUGENO_MEMBERSHIPS)
     )
 
     surface_gradient_universe = np.linspace(0, 0.1, n_samples, endpoint=True)
     surface_gradient_terms = ["Flat", "Gentle", "Steep"]
     surface_gradient = Antecedant(
-        "SurfaceGradient", surface_gradient_terms, surface_gradient_universe, get_membership_functions(surface_gradient_universe, SUGENO_MEMBERSHIPS)
+        "SurfaceGradient", surface_gradient_terms, surface_gradient_universe, get_parametric_membership_functions(surface_gradient_universe, SUGENO_MEMBERSHIPS)
     )
 
     velocity_universe = np.linspace(0, 10, n_samples, endpoint=True)
@@ -5,37 +5,36 @@
 
 
 import numpy as np
-import skfuzzy as fuzz
 
 from settings import MAMDANI_MEMBERSHIPS
 
 from src.model.fuzzy_inference.fuzzy_logic import Antecedant, Consequent
 from src.model.fuzzy_inference.mamdani import MamdaniRule, MamdaniFIS
-from src.model.fuzzy_inference.membership_functions import get_membership_functions
+from src.model.fuzzy_inference.membership_functions import get_parametric_membership_functions, TriangularMembership
 
 
 def get_enough_space_fis(n_samples):
     depart_lane_universe = np.linspace(0, 1, n_samples, endpoint=True)
     depart_lane = Antecedant(
         "DepartLane", ["Forbidden", "Allowed"], depart_lane_universe, [
-            fuzz.trimf(depart_lane_universe, [0, 0, 1]),
-            fuzz.trimf(depart_lane_universe, [0, 1, 1])
+            TriangularMembership(0, 0, 1),
+            TriangularMembership(0, 1, 1)
         ]
     )
 
     lateral_space_universe = np.linspace(0, 10, n_samples, endpoint=True)
     lateral_space = Antecedant(
-        "LateralSpace", ["Little", "Some", "Lots"], lateral_space_universe, get_membership_functions(lateral_space_universe, MAMDANI_MEMBERSHIPS)
+        "LateralSpace", ["Little", "Some", "Lots"], lateral_space_universe, get_parametric_membership_functions(lateral_space_universe, MAMDANI_MEMBERSHIPS)
     )
 
     machine_distance_universe = np.linspace(0, 10, n_samples, endpoint=True)
     machine_distance = Antecedant(
-        "MachineDistance", ["Close", "Medium", "Far"], machine_distance_universe, get_membership_functions(machine_distance_universe, MAMDANI_MEMBERSHIPS)
+        "MachineDistance", ["Close", "Medium", "Far"], machine_distance_universe, get_parametric_membership_functions(machine_distance_universe, MAMDANI_MEMBERSHIPS)
     )
 
     context_universe = np.linspace(0, 1, n_samples, endpoint=True)
     context = Consequent(
-        "Context", ["Inactive", "Transient", "Active"], context_universe, get_membership_functions(context_universe, MAMDANI_MEMBERSHIPS)
+        "Context", ["Inactive", "Transient", "Active"], context_universe, get_parametric_membership_functions(context_universe, MAMDANI_MEMBERSHIPS)
     )
 
     rules = [
@@ -10,23 +10,23 @@ from settings import MAMDANI_MEMBERSHIPS
 
 from src.model.fuzzy_inference.fuzzy_logic import Antecedant, Consequent
 from src.model.fuzzy_inference.mamdani import MamdaniRule, MamdaniFIS
-from src.model.fuzzy_inference.membership_functions import get_membership_functions
+from src.model.fuzzy_inference.membership_functions import get_parametric_membership_functions
 
 
 def get_sufficient_qos_fis(n_samples):
     latency_universe = np.linspace(0, 500, n_samples, endpoint=True)
     latency = Antecedant(
-        "Latency", ["Low", "Medium", "High"], latency_universe, get_membership_functions(latency_universe, MAMDANI_MEMBERSHIPS)
+        "Latency", ["Low", "Medium", "High"], latency_universe, get_parametric_membership_functions(latency_universe, MAMDANI_MEMBERSHIPS)
     )
 
     throughput_universe = np.linspace(0, 1000, n_samples, endpoint=True)
     throughput = Antecedant(
-        "Throughput", ["Low", "Medium", "High"], throughput_universe, get_membership_functions(throughput_universe, MAMDANI_MEMBERSHIPS)
+        "Throughput", ["Low", "Medium", "High"], throughput_universe, get_parametric_membership_functions(throughput_universe, MAMDANI_MEMBERSHIPS)
     )
 
     context_universe = np.linspace(0, 1, n_samples, endpoint=True)
     context = Consequent(
-        "Context", ["Inactive", "Transient", "Active"], context_universe, get_membership_functions(context_universe, MAMDANI_MEMBERSHIPS)
+        "Context", ["Inactive", "Transient", "Active"], context_universe, get_parametric_membership_functions(context_universe, MAMDANI_MEMBERSHIPS)
     )
 
     rules = [